@@ -1,8 +1,31 @@
+import os
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import plotly.express as px
 
+from cloudmart import reports
+from cloudmart.charts import default_max_points, figure_points, histogram, top_n, top_n_grouped
+from cloudmart.cube import COUNT_COLUMN, distinct_values, rollup
+from cloudmart.export import EXPORT_FORMATS, ExportCache, export_key, frame_chunks
+from cloudmart.figures import FigureCache, input_digest
+from cloudmart.filters import selection_key
+from cloudmart.inference import CONFIDENCE_COLUMN, DEFAULT_MIN_CONFIDENCE, load_suggester
+from cloudmart.ingest import TAG_LABELS
+from cloudmart.lazy import SectionMemo
+from cloudmart.paging import PAGE_SIZES, page_bounds, search_positions, sort_positions
+from cloudmart.partitions import (
+    MONTH_COLUMN, ingest_directory, list_partitions, load_partitions, partition_version, prune,
+    source_listing, store_for,
+)
+from cloudmart.policy import Policy, parse_policy, read_policy_text
+from cloudmart.profiling import Profiler, RunProfile, debug_enabled, enable_logging
+from cloudmart.remediation import REQUIRED_TAGS, empty_diff, merge_diffs, unedited
+from cloudmart.shared import SharedDataset
+from cloudmart.snapshot import DEFAULT_CACHE_DIR, fingerprint, load_snapshot
+from cloudmart.trends import TREND_DIMENSIONS, TrendStore, fit_trends, monthly_costs
+
 # ----------------------------------------------------------
 # APP CONFIG
 # ----------------------------------------------------------
@@ -17,30 +40,177 @@ for the Week 10 Cloud Resource Tagging case study.
 
 file_path = "cloudmart_multi_account.csv"
 
+# Point CLOUDMART_DATA_DIR at a directory of per-account/per-month exports
+# to load partitioned history instead of the single sample file.
+# CLOUDMART_WORKERS (a number or "auto") parses and aggregates in a process pool.
+data_dir = os.environ.get("CLOUDMART_DATA_DIR")
+store_dir = store_for(data_dir, DEFAULT_CACHE_DIR) if data_dir else None
+
+
+# Resource (not data) caches: every session gets the same SharedDataset
+# object instead of a pickled copy of the frame on each rerun. Keyed by
+# version, so a changed source loads once more; old versions are evicted.
+SHARED_VERSIONS = 4
+
+
+def share(df, version):
+    # Built while the loading spinner shows: every rerun needs them
+    return SharedDataset(df, version).warm()
+
+
+@st.cache_resource(show_spinner="Loading billing snapshot...", max_entries=SHARED_VERSIONS)
+def load_dataset(path, version):
+    # version (the content hash) is the cache key: a changed source
+    # file misses the cache and rebuilds its on-disk snapshot.
+    return share(load_snapshot(path)[1], version)
+
+
+@st.cache_resource(show_spinner="Ingesting billing exports...", max_entries=SHARED_VERSIONS)
+def ingest_exports(source, store, listing):
+    # listing (file names, sizes, mtimes) is the key: reruns with an unchanged
+    # directory neither fingerprint the exports nor touch the manifest
+    ingest_directory(source, store)
+    return list_partitions(store)
+
+
+@st.cache_resource(show_spinner="Loading billing partitions...", max_entries=SHARED_VERSIONS)
+def load_partitioned_dataset(store, _partitions, version):
+    # Only the partition files behind the sidebar selection are read.
+    return share(load_partitions(store, _partitions), version)
+
+
+@st.cache_resource
+def figure_cache():
+    # Shared by all sessions: rendered PNGs keyed by their input data
+    return FigureCache()
+
+
+@st.cache_resource(show_spinner="Fitting cost trends...", max_entries=len(TREND_DIMENSIONS))
+def load_trend_model(store, _partitions, by, version):
+    # Fitted months persist on disk: a new month only adds its own rows
+    return TrendStore().model(by, store, _partitions)
+
+
+@st.cache_resource(show_spinner="Training tag suggestions...", max_entries=SHARED_VERSIONS)
+def load_tag_suggester(_df, version, required_tags):
+    # Trained once per dataset version and persisted; reruns never retrain
+    return load_suggester(_df, version, list(required_tags))
+
+
+@st.cache_resource
+def compile_policy(text):
+    # Keyed by the file's content: editing the policy recompiles it once
+    return parse_policy(text)
+
+
+@st.cache_resource
+def export_cache():
+    # Shared by all sessions: export files on disk, keyed by their inputs
+    return ExportCache()
+
+
+def export_button(label, name, key, chunks):
+    """Format picker + download button; the file is only written on click."""
+    fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key=f"{name}_format")
+    ext, mime = EXPORT_FORMATS[fmt]
+    st.download_button(
+        f"{label} ({fmt})",
+        data=lambda: export_cache().read(name, key, fmt, chunks),
+        file_name=f"{name}{ext}",
+        mime=mime
+    )
+
+
+def paged_rows(key, frame, memo_key, positions=None, sizes=PAGE_SIZES):
+    """Search/sort/page controls over ``frame``; returns the visible page's row positions.
+
+    Only that page is ever sent to the browser. The searched and sorted
+    positions are memoized per session until ``memo_key`` or the controls change.
+    """
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    query = c1.text_input("Search", key=f"{key}_search", placeholder="Contains…")
+    sort_by = c2.selectbox("Sort by", [None] + list(frame.columns), key=f"{key}_sort",
+                           format_func=lambda col: "(original order)" if col is None else col)
+    ascending = c3.toggle("Ascending", value=True, key=f"{key}_asc")
+    size = c4.selectbox("Rows per page", sizes, key=f"{key}_size")
+
+    rows = tab_memo.get(key, (memo_key, query, sort_by, ascending), lambda: sort_positions(
+        frame, search_positions(frame, query, positions=positions), sort_by, ascending
+    ))
+    n_pages = page_bounds(len(rows), 1, size)[2]
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+    start, stop, _ = page_bounds(len(rows), page, size)
+    st.caption(f"Rows {min(start + 1, stop)}–{stop} of {len(rows):,} · page {page} of {n_pages}")
+    return rows[start:stop]
+
+
+# ----------------------------------------------------------
+# PER-RERUN INSTRUMENTATION
+# ----------------------------------------------------------
+if debug_enabled():
+    # CLOUDMART_DEBUG also streams the section records as JSON lines to stderr
+    enable_logging()
+profiler = Profiler()
+# A requested cProfile covers exactly one rerun, then switches itself off.
+run_profile = RunProfile(st.session_state.get("debug_cprofile", False))
+st.session_state["debug_cprofile"] = False
+debug_panel = st.sidebar.container()
+
+# Lazy tabs: only the active view runs; its results are memoized per
+# section until the data version or the filters they depend on change.
+lazy_tabs = st.session_state.get("lazy_tabs", True)
+tab_memo = SectionMemo(st.session_state.setdefault("tab_memo", {}))
+
 try:
+    run_profile.start()
+    profiler.mark("load")
+
     # ----------------------------------------------------------
-    # LOAD DATASET (unchanged)
+    # LOAD DATASET (cached columnar snapshot / pruned partitions)
     #----------------------------------------------------------
-    with open(file_path, "r", encoding="utf-8-sig") as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-    split_data = [line.split(",") for line in lines]
-    df = pd.DataFrame(split_data[1:], columns=split_data[0])
-
-    df.columns = df.columns.str.replace('"', '').str.strip()
-    df = df.applymap(lambda x: x.strip().replace('"', '') if isinstance(x, str) else x)
+    if data_dir:
+        # Incremental: only new or changed exports are parsed, once per listing
+        partitions = ingest_exports(data_dir, store_dir, source_listing(data_dir))
+
+        st.sidebar.header("🗂️ Billing Data")
+        accounts = sorted(partitions["AccountID"].unique())
+        months = sorted(partitions[MONTH_COLUMN].unique())
+        account_pick = st.sidebar.multiselect("Accounts", accounts, default=accounts) or accounts
+        month_pick = st.sidebar.multiselect("Billing months", months, default=months[-1:]) or months
+
+        selected_parts = prune(partitions, account_pick, month_pick)
+        dataset_version = partition_version(selected_parts)
+        shared = load_partitioned_dataset(store_dir, selected_parts, dataset_version)
+    else:
+        dataset_version = fingerprint(file_path).sha256
+        shared = load_dataset(file_path, dataset_version)
+    # Read-only and shared with every other session – never modify in place
+    df, cube, filter_index = shared.df, shared.cube, shared.filter_index
+    profiler.set_rows(len(df))
+    figures = figure_cache()
 
-    if "MonthlyCostUSD" in df.columns:
-        df["MonthlyCostUSD"] = pd.to_numeric(df["MonthlyCostUSD"], errors="coerce")
+    # ----------------------------------------------------------
+    # TAGGING POLICY (policies/tagging.yaml or CLOUDMART_POLICY)
+    #----------------------------------------------------------
+    try:
+        policy = compile_policy(read_policy_text())
+    except (OSError, ValueError) as e:
+        st.sidebar.warning(f"⚠️ Tagging policy not loaded ({e}); using the built-in required tags.")
+        policy = Policy([], REQUIRED_TAGS, "built-in")
+    required_tags = tuple(policy.required_tags)
 
     # ----------------------------------------------------------
     # GLOBAL SIDEBAR FILTERS (KEEP — FIXED)
     #----------------------------------------------------------
+    profiler.mark("filter")
     st.sidebar.header("🎛️ Global Filters")
 
     def multiselect_or_all(label, col):
         if col not in df.columns:
             return []
-        vals = sorted(df[col].dropna().unique())
+        vals = filter_index.values(col)
         selected = st.sidebar.multiselect(label, vals, default=vals)
         return selected or vals
 
@@ -50,135 +220,132 @@ try:
     svc_filter = multiselect_or_all("Service", "Service")
     region_filter = multiselect_or_all("Region", "Region")
 
-    # APPLY FILTERS (global)
-    filtered_df = df[
-        df["Department"].isin(dept_filter) &
-        df["Project"].isin(proj_filter) &
-        df["Environment"].isin(env_filter) &
-        df["Service"].isin(svc_filter) &
-        df["Region"].isin(region_filter)
-    ].copy()
+    # APPLY FILTERS (global) – row positions from the index, no frame copy
+    global_filters = {
+        "Department": dept_filter,
+        "Project": proj_filter,
+        "Environment": env_filter,
+        "Service": svc_filter,
+        "Region": region_filter,
+    }
+    filtered_rows = filter_index.select(global_filters)
+    profiler.set_rows(len(filtered_rows))
 
-    st.sidebar.success(f"Filters applied: {len(filtered_df)} rows displayed")
+    # Data-only sections live on the shared dataset; sections that follow
+    # the sidebar are memoized per session under filter_key
+    data_key = (dataset_version,)
+    filter_key = (dataset_version, selection_key(global_filters))
 
-    # ----------------------------------------------------------
-    # CREATE TABS (Same as original)
-    #----------------------------------------------------------
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "📘 Task 1 – Data Exploration",
-        "💰 Task 2 – Cost Visibility",
-        "🏷️ Task 3 – Tagging Compliance",
-        "📊 Task 4 – Visualization Dashboard",
-        "🛠️ Task 5 – Tag Remediation Workflow"
-    ])
+    st.sidebar.success(f"Filters applied: {len(filtered_rows)} rows displayed")
 
     # ==========================================================
     # 📘 TAB 1 – DATA EXPLORATION (Unmodified)
     # ==========================================================
-    with tab1:
-        st.subheader("📋 1.1 Dataset Preview (First 5 Rows)")
-        st.dataframe(filtered_df.head(), use_container_width=True)
+    def render_exploration():
+        profiler.mark("1.1 Dataset Preview", len(filtered_rows))
+        st.subheader("📋 1.1 Dataset Preview")
+        page_rows = paged_rows("preview", df, filter_key, positions=filtered_rows, sizes=(5, 25, 100))
+        st.dataframe(df.take(page_rows), use_container_width=True)
 
+        profiler.mark("1.2 Missing Values Check", len(df))
         st.subheader("🔍 1.2 Missing Values Check")
-        missing_summary = df.isnull().sum().reset_index()
-        missing_summary.columns = ["Column Name", "Missing Values"]
+        missing_summary = shared.derive("1.2", lambda: reports.missing_values_summary(df))
         st.dataframe(missing_summary, use_container_width=True)
 
+        profiler.mark("1.3 Columns with Most Missing Values", len(missing_summary))
         st.subheader("📊 1.3 Columns with Most Missing Values")
         st.bar_chart(missing_summary.set_index("Column Name"))
 
+        profiler.mark("1.4 Tagged vs Untagged Resources", len(df))
         st.subheader("📦 1.4 Tagged vs Untagged Resources")
         if "Tagged" in df.columns:
-            tagged = (df["Tagged"] == "Yes").sum()
-            untagged = (df["Tagged"] == "No").sum()
-            total = len(df)
+            status = shared.derive("1.4", lambda: reports.tag_status_counts(df))
+            tagged, untagged, total = status["tagged"], status["untagged"], status["total"]
 
             c1, c2, c3 = st.columns(3)
             c1.metric("Total Resources", total)
             c2.metric("Tagged", tagged)
             c3.metric("Untagged", untagged)
 
+            profiler.mark("1.5 Percentage Untagged Resources", total)
             st.subheader("📈 1.5 Percentage Untagged Resources")
-            pct = (untagged / total * 100) if total else 0
-            st.metric("Untagged (%)", f"{pct:.2f}%")
+            st.metric("Untagged (%)", f"{status['untagged_pct']:.2f}%")
 
+            profiler.mark("Visual Insights", len(filtered_rows))
             st.subheader("📊 Visual Insights")
             col1, col2 = st.columns(2)
 
             # Chart 1
             with col1:
-                if "Department" in filtered_df.columns:
-                    dept_cost = filtered_df.groupby("Department")["MonthlyCostUSD"].sum().reset_index()
-                    fig1, ax1 = plt.subplots(figsize=(3.5, 2.5))
-                    ax1.bar(dept_cost["Department"], dept_cost["MonthlyCostUSD"])
-                    ax1.set_title("💰 Cost by Department")
-                    plt.tight_layout()
-                    st.pyplot(fig1)
+                if "Department" in cube.columns:
+                    dept_cost = tab_memo.get("1.x dept", filter_key, lambda: rollup(cube, "Department", global_filters))
+                    def draw_fig1(fig):
+                        ax1 = fig.subplots()
+                        ax1.bar(dept_cost["Department"], dept_cost["MonthlyCostUSD"])
+                        ax1.set_title("💰 Cost by Department")
+
+                    profiler.mark("render fig1", len(dept_cost))
+                    st.image(figures.get("fig1", [dept_cost], draw_fig1, (3.5, 2.5)), width="stretch")
 
             # Chart 2
             with col2:
-                fig2, ax2 = plt.subplots(figsize=(3.5, 2.5))
-                ax2.pie([tagged, untagged], labels=["Tagged", "Untagged"], autopct="%1.1f%%")
-                ax2.set_title("🏷️ Tag Distribution")
-                st.pyplot(fig2)
+                def draw_fig2(fig):
+                    ax2 = fig.subplots()
+                    ax2.pie([tagged, untagged], labels=["Tagged", "Untagged"], autopct="%1.1f%%")
+                    ax2.set_title("🏷️ Tag Distribution")
+
+                profiler.mark("render fig2", 2)
+                st.image(figures.get("fig2", [tagged, untagged], draw_fig2, (3.5, 2.5)), width="stretch")
 
     # ==========================================================
     # 💰 TAB 2 – COST VISIBILITY (FULL & FIXED)
     # ==========================================================
-    with tab2:
+    def render_cost_visibility():
         st.header("💰 Task 2 – Cost Visibility")
         st.markdown("""
         This section completes **Task Set 2** from the Week 10 case study.  
         It analyzes cloud cost visibility using tag completeness.
         """)
 
-        cost_df = filtered_df.copy()
-
         # -----------------------------------------
         # 2.1 – Cost of Tagged vs Untagged
         # -----------------------------------------
+        profiler.mark("2.1 – Total Cost of Tagged vs Untagged Resources", len(filtered_rows))
         st.subheader("2.1 – Total Cost of Tagged vs Untagged Resources")
 
-        if "Tagged" in cost_df.columns:
-            cost_by_tag = (
-                cost_df.groupby("Tagged")["MonthlyCostUSD"]
-                .sum().reset_index()
-            )
+        if "Tagged" in cube.columns:
+            cost_by_tag = tab_memo.get("2.1", filter_key, lambda: reports.cost_by_tag_status(cube, global_filters))
             st.dataframe(cost_by_tag, use_container_width=True)
 
-            tagged_cost = cost_by_tag.loc[cost_by_tag["Tagged"] == "Yes", "MonthlyCostUSD"].sum()
-            untagged_cost = cost_by_tag.loc[cost_by_tag["Tagged"] == "No", "MonthlyCostUSD"].sum()
-            total_cost = tagged_cost + untagged_cost
-
             colA, colB = st.columns(2)
 
             # Small bar chart
             with colA:
-                fig3, ax3 = plt.subplots(figsize=(3.5, 2.5))
-                ax3.bar(cost_by_tag["Tagged"], cost_by_tag["MonthlyCostUSD"],
-                        color=["#2E86AB", "#E27D60"])
-                ax3.set_title("💰 Total Cost by Tag Status", fontsize=10)
-                ax3.set_ylabel("Total Cost (USD)")
-                plt.tight_layout()
-                st.pyplot(fig3)
+                def draw_fig3(fig):
+                    ax3 = fig.subplots()
+                    ax3.bar(cost_by_tag["Tagged"], cost_by_tag["MonthlyCostUSD"],
+                            color=["#2E86AB", "#E27D60"])
+                    ax3.set_title("💰 Total Cost by Tag Status", fontsize=10)
+                    ax3.set_ylabel("Total Cost (USD)")
+
+                profiler.mark("render fig3", len(cost_by_tag))
+                st.image(figures.get("fig3", [cost_by_tag], draw_fig3, (3.5, 2.5)), width="stretch")
 
             # -----------------------------------------
             # 2.2 – % of total cost that is untagged
             # -----------------------------------------
             with colB:
-                pct_untagged_cost = (untagged_cost / total_cost * 100) if total_cost else 0
+                pct_untagged_cost = reports.untagged_cost_pct(cost_by_tag)
                 st.metric("2.2 – Untagged Cost (%)", f"{pct_untagged_cost:.2f}%")
 
             # -----------------------------------------
             # 2.3 – Department with most untagged cost
             # -----------------------------------------
+            profiler.mark("2.3 – Department with the Most Untagged Cost", len(filtered_rows))
             st.subheader("2.3 – Department with the Most Untagged Cost")
-            if "Department" in cost_df.columns:
-                untag_by_dept = (
-                    cost_df[cost_df["Tagged"] == "No"]
-                    .groupby("Department")["MonthlyCostUSD"]
-                    .sum()
-                    .sort_values(ascending=False)
+            if "Department" in cube.columns:
+                untag_by_dept = tab_memo.get(
+                    "2.3", filter_key, lambda: reports.untagged_cost_by_department(cube, global_filters)
                 )
                 st.dataframe(untag_by_dept.head(5), use_container_width=True)
             else:
@@ -187,13 +354,10 @@ try:
             # -----------------------------------------
             # 2.4 – Project consuming most overall cost
             # -----------------------------------------
+            profiler.mark("2.4 – Project Consuming the Most Total Cost", len(filtered_rows))
             st.subheader("2.4 – Project Consuming the Most Total Cost")
-            if "Project" in cost_df.columns:
-                proj_cost = (
-                    cost_df.groupby("Project")["MonthlyCostUSD"]
-                    .sum()
-                    .sort_values(ascending=False)
-                )
+            if "Project" in cube.columns:
+                proj_cost = tab_memo.get("2.4", filter_key, lambda: reports.cost_by_project(cube, global_filters))
                 st.dataframe(proj_cost.head(5))
             else:
                 st.info("Project column not found.")
@@ -201,25 +365,26 @@ try:
             # -----------------------------------------
             # 2.5 – Prod vs Dev/Test – Cost & Tag Quality
             # -----------------------------------------
+            profiler.mark("2.5 – Prod vs Dev/Test — Cost & Tag Quality", len(filtered_rows))
             st.subheader("2.5 – Prod vs Dev/Test — Cost & Tag Quality")
-            if "Environment" in cost_df.columns:
-                env_tag = (
-                    cost_df.groupby(["Environment", "Tagged"])["MonthlyCostUSD"]
-                    .sum()
-                    .reset_index()
+            if "Environment" in cube.columns:
+                env_tag = tab_memo.get(
+                    "2.5", filter_key, lambda: reports.cost_by_environment_and_tag(cube, global_filters)
                 )
                 st.dataframe(env_tag, use_container_width=True)
 
-                fig5, ax5 = plt.subplots(figsize=(4, 3))
-                for tag_status in env_tag["Tagged"].unique():
-                    subset = env_tag[env_tag["Tagged"] == tag_status]
-                    ax5.bar(subset["Environment"], subset["MonthlyCostUSD"], label=tag_status)
+                def draw_fig5(fig):
+                    ax5 = fig.subplots()
+                    for tag_status in env_tag["Tagged"].unique():
+                        subset = env_tag[env_tag["Tagged"] == tag_status]
+                        ax5.bar(subset["Environment"], subset["MonthlyCostUSD"], label=tag_status)
+
+                    ax5.set_title("Environment Cost vs Tagging Status")
+                    ax5.set_ylabel("Monthly Cost (USD)")
+                    ax5.legend()
 
-                ax5.set_title("Environment Cost vs Tagging Status")
-                ax5.set_ylabel("Monthly Cost (USD)")
-                ax5.legend()
-                plt.tight_layout()
-                st.pyplot(fig5)
+                profiler.mark("render fig5", len(env_tag))
+                st.image(figures.get("fig5", [env_tag], draw_fig5, (4, 3)), width="stretch")
             else:
                 st.info("Environment column not found.")
         else:
@@ -228,82 +393,100 @@ try:
     # ==========================================================
     # 🏷️ TAB 3 – TASK SET 3: TAGGING COMPLIANCE (3.1–3.5)
     # ==========================================================
-    with tab3:
+    def render_compliance():
         st.header("🏷️ Task 3 – Tagging Compliance")
         st.markdown("""
         This section completes **Task Set 3** of the Week 10 case study.  
         It measures tagging completeness and identifies gaps.
         """)
 
-        tag_fields = [
-            "Department", "Project", "Environment", "Owner",
-            "CostCenter", "CreatedBy", "Tagged"
-        ]
-
-        # Ensure all tag fields exist
-        for col in tag_fields:
-            if col not in df.columns:
-                df[col] = None
+        completeness = shared.completeness(list(required_tags) + ["Tagged"])
 
         # 3.1 Tag completeness score per resource
+        profiler.mark("3.1 – Tag Completeness Score per Resource", len(df))
         st.subheader("3.1 – Tag Completeness Score per Resource")
-        df["TagCompletenessScore"] = df[tag_fields].apply(
-            lambda row: sum(pd.notna(row) & (row != "")), axis=1
-        )
-        show_cols = ["ResourceID", "TagCompletenessScore"] if "ResourceID" in df.columns else ["TagCompletenessScore"]
-        st.dataframe(df[show_cols].head(), use_container_width=True)
+        st.dataframe(reports.scores_table(df, completeness.scores.head()), use_container_width=True)
 
         # 3.2 Top 5 lowest completeness scores
+        profiler.mark("3.2 – Top 5 Resources with Lowest Completeness Scores", len(df))
         st.subheader("3.2 – Top 5 Resources with Lowest Completeness Scores")
-        lowest5_cols = show_cols
-        lowest5 = df.nsmallest(5, "TagCompletenessScore")[lowest5_cols]
+        lowest5 = reports.scores_table(df, completeness.lowest(5))
         st.dataframe(lowest5, use_container_width=True)
 
         # 3.3 Most frequently missing tag fields
+        profiler.mark("3.3 – Most Frequently Missing Tag Fields", len(df))
         st.subheader("3.3 – Most Frequently Missing Tag Fields")
-        missing_counts = df[tag_fields].isna().sum().reset_index()
-        missing_counts.columns = ["Tag Field", "Missing Count"]
+        missing_counts = completeness.missing_counts
         st.dataframe(missing_counts.sort_values("Missing Count", ascending=False),
                      use_container_width=True)
 
-        fig6, ax6 = plt.subplots(figsize=(4, 2.8))
-        ax6.bar(missing_counts["Tag Field"], missing_counts["Missing Count"], color="#FFB347")
-        ax6.set_title("📊 Missing Tag Fields Count", fontsize=10)
-        plt.xticks(rotation=45, ha="right", fontsize=8)
-        plt.tight_layout()
-        st.pyplot(fig6, use_container_width=True)
+        def draw_fig6(fig):
+            ax6 = fig.subplots()
+            ax6.bar(missing_counts["Tag Field"], missing_counts["Missing Count"], color="#FFB347")
+            ax6.set_title("📊 Missing Tag Fields Count", fontsize=10)
+            ax6.tick_params(axis="x", labelrotation=45, labelsize=8)
+            for label in ax6.get_xticklabels():
+                label.set_horizontalalignment("right")
+
+        profiler.mark("render fig6", len(missing_counts))
+        st.image(figures.get("fig6", [missing_counts], draw_fig6, (4, 2.8)), width="stretch")
 
         # 3.4 list all untagged resources and their costs
+        profiler.mark("3.4 – List of Untagged Resources and Costs", len(df))
         st.subheader("3.4 – List of Untagged Resources and Costs")
         if "Tagged" in df.columns:
-            untagged_df = df[df["Tagged"].str.lower() == "no"][["ResourceID", "MonthlyCostUSD"]]
-            st.dataframe(untagged_df, use_container_width=True)
+            untagged_df = shared.derive("3.4", lambda: reports.untagged_resources(df))
+            profiler.set_rows(len(untagged_df))
+            page_rows = paged_rows("untagged_costs", untagged_df, data_key)
+            st.dataframe(untagged_df.iloc[page_rows], use_container_width=True)
         else:
             untagged_df = pd.DataFrame()
             st.warning("No 'Tagged' column found.")
 
         # 3.5 export untagged resources to CSV
+        profiler.mark("3.5 – Export Untagged Resources to CSV", len(untagged_df))
         st.subheader("3.5 – Export Untagged Resources to CSV")
         if not untagged_df.empty:
-            csv_data = untagged_df.to_csv(index=False)
-            st.download_button(
-                "⬇️ Download Untagged CSV",
-                data=csv_data,
-                file_name="untagged_resources.csv",
-                mime="text/csv"
+            export_button(
+                "⬇️ Download Untagged Resources",
+                "untagged_resources",
+                export_key(dataset_version),
+                lambda: frame_chunks(untagged_df),
             )
         else:
             st.info("No untagged resources to export.")
 
+        # 3.6 tagging policy rules (compiled checks, cached per data + policy version)
+        profiler.mark("3.6 – Tagging Policy Violations", len(filtered_rows))
+        st.subheader("3.6 – Tagging Policy Violations")
+        if not policy.rules:
+            st.info("No tagging policy rules loaded.")
+            return
+
+        policy_report = shared.policy_report(policy)
+        policy_key = (filter_key, policy.version)
+        cost_at_risk = tab_memo.get("3.6 risk", policy_key, lambda: policy_report.cost_at_risk(filtered_rows))
+        st.metric("Cost at Risk (USD)", f"{cost_at_risk:,.2f}")
+        st.dataframe(tab_memo.get("3.6", policy_key, lambda: policy_report.summary(filtered_rows)),
+                     use_container_width=True, hide_index=True)
+
+        rule_id = st.selectbox("Violating resources for rule", policy.rule_ids, key="policy_rule")
+        violators = tab_memo.get("3.6 violators", policy_key + (rule_id,), lambda: np.intersect1d(
+            policy_report.violators(rule_id), filtered_rows, assume_unique=True
+        ))
+        page_rows = paged_rows("policy_violators", df, policy_key + (rule_id,), positions=violators)
+        st.dataframe(df.take(page_rows), use_container_width=True)
+
     # ==========================================================
     # 📊 TAB 4 – TASK SET 4: VISUALIZATION DASHBOARD (FIXED)
     # ==========================================================
-    with tab4:
+    def render_dashboard():
         st.header("📊 Task 4 – Visualization Dashboard")
 
         # ------------------------------------------------------
         # 4.5 Interactive Dashboard Filters (WORKING VERSION)
         # ------------------------------------------------------
+        profiler.mark("4.5 – Interactive Dashboard Filters", len(filtered_rows))
         st.subheader("4.5 – Interactive Dashboard Filters")
 
         colf1, colf2, colf3 = st.columns(3)
@@ -311,176 +494,332 @@ try:
         with colf1:
             svc_pick = st.multiselect(
                 "Service",
-                sorted(filtered_df["Service"].dropna().unique()),
+                distinct_values(cube, "Service", global_filters),
                 default=None
             )
         with colf2:
             region_pick = st.multiselect(
                 "Region",
-                sorted(filtered_df["Region"].dropna().unique()),
+                distinct_values(cube, "Region", global_filters),
                 default=None
             )
         with colf3:
             dept_pick = st.multiselect(
                 "Department",
-                sorted(filtered_df["Department"].dropna().unique()),
+                distinct_values(cube, "Department", global_filters),
                 default=None
             )
 
-        # Start with GLOBAL filtered DF
-        viz_df = filtered_df.copy()
+        # Start with GLOBAL filters
+        viz_filters = dict(global_filters)
 
         # Apply 4.5 filters ONLY if user picked values
         if svc_pick:
-            viz_df = viz_df[viz_df["Service"].isin(svc_pick)]
+            viz_filters["Service"] = svc_pick
         if region_pick:
-            viz_df = viz_df[viz_df["Region"].isin(region_pick)]
+            viz_filters["Region"] = region_pick
         if dept_pick:
-            viz_df = viz_df[viz_df["Department"].isin(dept_pick)]
+            viz_filters["Department"] = dept_pick
 
-        st.info(f"Rows after dashboard filters: {len(viz_df)}")
+        viz_rows = filter_index.select(viz_filters)
+        profiler.set_rows(len(viz_rows))
+        st.info(f"Rows after dashboard filters: {len(viz_rows)}")
 
         # ------------------------------------------------------
-        # ALL CHARTS BELOW MUST USE viz_df
+        # ALL CHARTS BELOW ROLL UP THE CUBE UNDER viz_filters
+        # and send Plotly at most max_points points per figure
         # ------------------------------------------------------
+        max_points = default_max_points()
+        viz_key = (dataset_version, selection_key(viz_filters), max_points)
 
         # 4.1 Pie chart – Tagged vs Untagged
+        profiler.mark("4.1 – Tagged vs Untagged Resources", len(viz_rows))
         st.subheader("4.1 – Tagged vs Untagged Resources")
-        if "Tagged" in viz_df.columns:
-            pie_fig = px.pie(
-                viz_df,
-                names="Tagged",
-                title="Tag Distribution",
-                color_discrete_sequence=px.colors.qualitative.Pastel
-            )
+        if "Tagged" in cube.columns:
+            def pie_figure():
+                tag_counts = rollup(cube, "Tagged", viz_filters)
+                tag_counts["Tagged"] = tag_counts["Tagged"].map(TAG_LABELS)
+                return px.pie(
+                    tag_counts,
+                    names="Tagged",
+                    values=COUNT_COLUMN,
+                    title="Tag Distribution",
+                    color_discrete_sequence=px.colors.qualitative.Pastel
+                )
+
+            pie_fig = tab_memo.get("4.1", viz_key, pie_figure)
+            profiler.mark("render pie_fig", figure_points(pie_fig))
             st.plotly_chart(pie_fig, use_container_width=True)
 
         # 4.2 Cost per Department by Tagging
+        profiler.mark("4.2 – Cost per Department by Tagging Status", len(viz_rows))
         st.subheader("4.2 – Cost per Department by Tagging Status")
-        if "Department" in viz_df.columns:
-            dept_cost = viz_df.groupby(["Department", "Tagged"])["MonthlyCostUSD"].sum().reset_index()
-            bar_fig = px.bar(
-                dept_cost,
-                x="Department",
-                y="MonthlyCostUSD",
-                color="Tagged",
-                barmode="group",
-                title="Cost by Department and Tag Status"
-            )
+        if "Department" in cube.columns:
+            def dept_figure():
+                dept_cost = rollup(cube, ["Department", "Tagged"], viz_filters)
+                dept_cost["Tagged"] = dept_cost["Tagged"].map(TAG_LABELS)
+                dept_cost = top_n_grouped(dept_cost, "Department", "Tagged", "MonthlyCostUSD", max_points)
+                return px.bar(
+                    dept_cost,
+                    x="Department",
+                    y="MonthlyCostUSD",
+                    color="Tagged",
+                    barmode="group",
+                    title="Cost by Department and Tag Status"
+                )
+
+            bar_fig = tab_memo.get("4.2", viz_key, dept_figure)
+            profiler.mark("render bar_fig", figure_points(bar_fig))
             st.plotly_chart(bar_fig, use_container_width=True)
 
         # 4.3 Total Cost per Service (Horizontal)
+        profiler.mark("4.3 – Total Cost per Service", len(viz_rows))
         st.subheader("4.3 – Total Cost per Service")
-        if "Service" in viz_df.columns:
-            svc_cost = viz_df.groupby("Service")["MonthlyCostUSD"].sum().reset_index()
-            svc_fig = px.bar(
-                svc_cost,
-                y="Service",
-                x="MonthlyCostUSD",
-                orientation="h",
-                title="Total Cost per Service"
-            )
+        if "Service" in cube.columns:
+            def service_figure():
+                svc_cost = top_n(rollup(cube, "Service", viz_filters), "Service", "MonthlyCostUSD", max_points)
+                return px.bar(
+                    svc_cost,
+                    y="Service",
+                    x="MonthlyCostUSD",
+                    orientation="h",
+                    title="Total Cost per Service"
+                )
+
+            svc_fig = tab_memo.get("4.3", viz_key, service_figure)
+            profiler.mark("render svc_fig", figure_points(svc_fig))
             st.plotly_chart(svc_fig, use_container_width=True)
 
         # 4.4 Cost by Environment
+        profiler.mark("4.4 – Cost by Environment", len(viz_rows))
         st.subheader("4.4 – Cost by Environment")
-        if "Environment" in viz_df.columns:
-            env_fig = px.bar(
-                viz_df,
-                x="Environment",
-                y="MonthlyCostUSD",
-                color="Environment",
-                title="Cost by Environment"
-            )
+        if "Environment" in cube.columns:
+            def environment_figure():
+                env_cost = top_n(rollup(cube, "Environment", viz_filters), "Environment", "MonthlyCostUSD", max_points)
+                return px.bar(
+                    env_cost,
+                    x="Environment",
+                    y="MonthlyCostUSD",
+                    color="Environment",
+                    title="Cost by Environment"
+                )
+
+            env_fig = tab_memo.get("4.4", viz_key, environment_figure)
+            profiler.mark("render env_fig", figure_points(env_fig))
             st.plotly_chart(env_fig, use_container_width=True)
 
+        # 4.6 Distribution of per-resource cost (binned server-side)
+        profiler.mark("4.6 – Resource Cost Distribution", len(viz_rows))
+        st.subheader("4.6 – Resource Cost Distribution")
+        def cost_histogram_figure():
+            cost_bins = histogram(df["MonthlyCostUSD"].to_numpy()[viz_rows], max_points)
+            cost_bins["Range"] = [f"{lo:,.0f}–{hi:,.0f}" for lo, hi in zip(cost_bins["BinStart"], cost_bins["BinEnd"])]
+            return px.bar(
+                cost_bins,
+                x="Range",
+                y="Count",
+                title="Resources by Monthly Cost (USD)"
+            )
+
+        hist_fig = tab_memo.get("4.6", viz_key, cost_histogram_figure)
+        profiler.mark("render hist_fig", figure_points(hist_fig))
+        st.plotly_chart(hist_fig, use_container_width=True)
+
+
+    # ==========================================================
+    # 📈 COST TRENDS & FORECAST (multi-month data)
+    # ==========================================================
+    def render_trends():
+        st.header("📈 Cost Trends & Forecast")
+        st.markdown("""
+        Monthly tagged and untagged cost per series, with a linear-trend
+        forecast of next month's spend and a 95% prediction interval.
+        """)
+
+        dims = [col for col in TREND_DIMENSIONS if col in df.columns]
+        by = st.selectbox("Trend by", dims, key="trend_by")
+
+        profiler.mark("trend model", len(df))
+        if data_dir:
+            # Every ingested month, independent of the sidebar month picker
+            model = load_trend_model(store_dir, partitions, by, partition_version(partitions))
+        elif MONTH_COLUMN in df.columns:
+            model = shared.derive(f"trends:{by}", lambda: fit_trends(monthly_costs(df, by), by))
+        else:
+            st.info(f"No {MONTH_COLUMN} column: load monthly exports via CLOUDMART_DATA_DIR to see trends.")
+            return
+        profiler.set_rows(model.history.size)  # months x series fitted
+
+        forecast = model.forecast()
+        if by in global_filters:
+            forecast = forecast[forecast.index.get_level_values(by).isin(global_filters[by])]
+
+        profiler.mark("Next-month forecast", len(forecast))
+        st.subheader(f"Forecast for {forecast.attrs[MONTH_COLUMN]} ({model.n_months} months fitted)")
+        top = forecast.sort_values("Forecast", ascending=False).head(default_max_points())
+        st.dataframe(top.reset_index(), use_container_width=True, hide_index=True)
+
+        profiler.mark("Monthly cost history")
+        st.subheader("Monthly Cost History")
+
+        def trend_figure():
+            history = model.history[top.index[:10]]
+            history.columns = [f"{name} ({status})" for name, status in history.columns]
+            long = history.rename_axis(MONTH_COLUMN).reset_index().melt(
+                MONTH_COLUMN, var_name="Series", value_name="MonthlyCostUSD"
+            )
+            return px.line(long, x=MONTH_COLUMN, y="MonthlyCostUSD", color="Series", markers=True,
+                           title=f"Top {by} series by forecast cost")
+
+        trend_key = (tuple(sorted(model.months.items())), by, selection_key(global_filters))
+        trend_fig = tab_memo.get("trends", trend_key, trend_figure)
+        profiler.set_rows(figure_points(trend_fig))
+        st.plotly_chart(trend_fig, use_container_width=True)
 
     # ==========================================================
     # 🛠️ TAB 5 – TASK SET 5: TAG REMEDIATION WORKFLOW (Correct Version)
     # ==========================================================
-    with tab5:
+    def render_remediation():
         st.header("🛠️ Task 5 – Tag Remediation Workflow")
         st.markdown("""
         In this section, we identify untagged resources, fix missing tags,
         export a corrected dataset, and compare tagging before and after remediation.
         """)
 
-        # Make a working copy
-        original = df.copy()
-
-        # Required tag fields for remediation
-        required_tags = ["Department", "Project", "Owner", "CostCenter", "CreatedBy", "Environment"]
+        # ResourceID index over the shared dataset; edits live in a diff
+        engine = shared.remediation(required_tags)
+
+        def session_diff(name):
+            # Cell diffs are only valid for the dataset version they were made on,
+            # and only for tags the current policy still requires
+            version, diff = st.session_state.get(name, (None, None))
+            if version != dataset_version:
+                return empty_diff()
+            return diff[diff["column"].isin(engine.required_tags)].reset_index(drop=True)
+
+        def record_diff(diff):
+            # Keep only the changed cells, keyed to this dataset version;
+            # cells edited back to their base value drop out
+            st.session_state["remediation_diff"] = (
+                dataset_version, engine.compact(merge_diffs(session_diff("remediation_diff"), diff))
+            )
 
         # ------------------------------------------------------
         # 5.1 — Show untagged resources
         # ------------------------------------------------------
+        profiler.mark("5.1 – Untagged Resources")
         st.subheader("5.1 – Untagged Resources")
 
         # Untagged = any required tag missing
-        untagged_mask = original[required_tags].isna().any(axis=1) | (original[required_tags] == "").any(axis=1)
-        untagged_df = original[untagged_mask].copy()
+        untagged_rows = shared.derive(("5.1", required_tags), lambda: np.flatnonzero(engine.untagged_mask))
+        profiler.set_rows(len(untagged_rows))
 
-        if untagged_df.empty:
+        if len(untagged_rows) == 0:
             st.success("🎉 All resources are fully tagged!")
-            st.stop()
+            return
 
-        st.dataframe(untagged_df, use_container_width=True)
+        # One pager drives both this view and the editor below
+        page_rows = paged_rows("untagged_resources", df, (dataset_version, required_tags), positions=untagged_rows)
+        st.dataframe(df.take(page_rows), use_container_width=True)
+
+        # ------------------------------------------------------
+        # 5.1b — Suggested tags (learned from fully tagged resources)
+        # ------------------------------------------------------
+        profiler.mark("5.1b – Suggested Tags", len(untagged_rows))
+        st.subheader("5.1b – Suggested Tags")
+
+        suggester = load_tag_suggester(df, dataset_version, required_tags)
+        suggestions = shared.derive(
+            ("5.1b", required_tags), lambda: suggester.suggest(df, np.flatnonzero(engine.untagged_mask))
+        )
+        min_confidence = st.slider(
+            "Minimum confidence", 0.0, 1.0, DEFAULT_MIN_CONFIDENCE, 0.05, key="suggest_min_confidence"
+        )
+        confident = suggestions[suggestions[CONFIDENCE_COLUMN] >= min_confidence]
+
+        if confident.empty:
+            st.info("No suggestions at this confidence level.")
+        else:
+            summary = confident.groupby("column")[CONFIDENCE_COLUMN].agg(["count", "mean"])
+            st.dataframe(summary.rename(columns={"count": "Suggestions", "mean": "Mean Confidence"}),
+                         use_container_width=True)
+            review = shared.derive(("5.1b review", required_tags), lambda: suggestions.assign(
+                ResourceID=df["ResourceID"].to_numpy()[suggestions["row"].to_numpy()]
+            )[["ResourceID", "column", "value", CONFIDENCE_COLUMN]].rename(
+                columns={"column": "Tag", "value": "Suggested Value", CONFIDENCE_COLUMN: "Confidence"}
+            ))
+            review_rows = paged_rows("suggestions", review, (dataset_version, required_tags, min_confidence),
+                                     positions=np.flatnonzero(suggestions[CONFIDENCE_COLUMN] >= min_confidence))
+            st.dataframe(review.iloc[review_rows], use_container_width=True, hide_index=True)
+            # Cells an analyst already edited keep their value
+            fresh = unedited(confident[["row", "column", "value"]], session_diff("remediation_diff"))
+            if not fresh.empty and st.button(f"Accept {len(fresh)} suggestions"):
+                record_diff(fresh)
+                st.success("✅ Suggestions applied!")
 
         st.info("Edit the missing fields below to remediate tagging.")
 
-        # Editable version of missing rows
+        # Editable version of the current page, showing edits made so far;
+        # changes are collected as pending cells until they are applied
+        applied = session_diff("remediation_diff")
+        pending = session_diff("remediation_pending")
+        page_view = engine.view(page_rows, merge_diffs(applied, pending))
+        # Free text: categorical columns would only offer values already in the data
+        page_view = page_view.astype({tag: object for tag in engine.required_tags})
         edited = st.data_editor(
-            untagged_df,
+            page_view,
             use_container_width=True,
             num_rows="dynamic",
-            key="remediation_editor"
+            key=f"remediation_editor_{hash(page_rows.tobytes())}"
         )
+        # This page's pending cells (every copy of its ResourceIDs) are rebuilt
+        # from the editor on every rerun, so clearing a cell or typing its old
+        # value back undoes the edit
+        page_cells = engine.lookup(page_view["ResourceID"].to_numpy())[1]
+        pending = merge_diffs(pending[~pending["row"].isin(page_cells)], engine.diff(edited, applied))
+        st.session_state["remediation_pending"] = (dataset_version, pending)
+        st.caption(f"{len(pending)} edited cells pending")
 
         # ------------------------------------------------------
         # 5.2 — Apply remediation
         # ------------------------------------------------------
+        profiler.mark("5.2 – Apply Remediation", len(pending))
         st.subheader("5.2 – Apply Remediation")
 
         if st.button("Apply Remediation"):
-            remediated = original.copy()
-
-            # Update only the remediated rows
-            for rid in edited["ResourceID"]:
-                row_new = edited[edited["ResourceID"] == rid].iloc[0]
-                remediated.loc[remediated["ResourceID"] == rid, required_tags] = row_new[required_tags].values
-
-            # Re-evaluate tagging
-            remediated["Tagged"] = remediated[required_tags].notna().all(axis=1)
-            remediated["Tagged"] = remediated["Tagged"].replace({True: "Yes", False: "No"})
-
-            st.session_state["remediated_df"] = remediated
+            record_diff(pending)
+            st.session_state.pop("remediation_pending", None)
             st.success("✅ Remediation applied!")
 
         # If no remediation yet, stop here
-        if "remediated_df" not in st.session_state:
-            st.stop()
-
-        remediated_df = st.session_state["remediated_df"]
+        if "remediation_diff" not in st.session_state or \
+                st.session_state["remediation_diff"][0] != dataset_version:
+            return
+        remediation_diff = session_diff("remediation_diff")
 
         # ------------------------------------------------------
         # 5.3 — Download remediated dataset
         # ------------------------------------------------------
+        profiler.mark("5.3 – Download Remediated Dataset", len(df))
         st.subheader("5.3 – Download Remediated Dataset")
 
-        st.download_button(
-            "⬇️ Download remediated_cloudmart.csv",
-            data=remediated_df.to_csv(index=False),
-            file_name="remediated_cloudmart.csv",
-            mime="text/csv"
+        # Streamed slice by slice from base + diff, never a full second copy
+        export_button(
+            "⬇️ Download Remediated Dataset",
+            "remediated_cloudmart",
+            # Tagged is recomputed under the policy's required tags
+            export_key(dataset_version, required_tags, input_digest(remediation_diff)),
+            lambda: engine.iter_materialized(remediation_diff),
         )
 
         # ------------------------------------------------------
         # 5.4 — Compare before vs after
         # ------------------------------------------------------
+        profiler.mark("5.4 – Tagging Comparison (Before vs After)", len(df))
         st.subheader("5.4 – Tagging Comparison (Before vs After)")
 
-        before_counts = original["Tagged"].value_counts()
-        after_counts = remediated_df["Tagged"].value_counts()
+        before_counts = df["Tagged"].value_counts().rename(TAG_LABELS)
+        after_counts = engine.tag_counts(remediation_diff).rename(TAG_LABELS)
 
         comparison = pd.DataFrame({
             "Before": before_counts,
@@ -492,6 +831,7 @@ try:
         # ------------------------------------------------------
         # 5.5 — Reflection
         # ------------------------------------------------------
+        profiler.mark("5.5 – Reflection", 0)
         st.subheader("5.5 – Reflection")
         st.text_area(
             "How does improved tagging enhance cloud accountability and cost visibility?",
@@ -505,7 +845,49 @@ try:
         )
 
 
-except FileNotFoundError:
-    st.error("❌ File cloudmart_multi_account.csv not found.")
+    # ----------------------------------------------------------
+    # CREATE TABS – lazily (only the active view runs) or all at once
+    #----------------------------------------------------------
+    profiler.mark("tabs", len(filtered_rows))
+    tab_views = {
+        "📘 Task 1 – Data Exploration": render_exploration,
+        "💰 Task 2 – Cost Visibility": render_cost_visibility,
+        "🏷️ Task 3 – Tagging Compliance": render_compliance,
+        "📊 Task 4 – Visualization Dashboard": render_dashboard,
+        "🛠️ Task 5 – Tag Remediation Workflow": render_remediation,
+        "📈 Cost Trends & Forecast": render_trends,
+    }
+
+    if lazy_tabs:
+        active_view = st.radio(
+            "View", list(tab_views), horizontal=True, key="active_view", label_visibility="collapsed"
+        )
+        tab_views[active_view]()
+    else:
+        for tab, render in zip(st.tabs(list(tab_views)), tab_views.values()):
+            with tab:
+                render()
+
+
+except FileNotFoundError as e:
+    st.error(f"❌ File {e.filename or file_path} not found.")
 except Exception as e:
     st.error(f"Error loading dataset: {e}")
+finally:
+    # Runs on errors too, so every rerun is measured and logged
+    cprofile_report = run_profile.stop()
+    total_ms = profiler.finish()
+    if cprofile_report:
+        st.session_state["cprofile_report"] = cprofile_report
+
+    with debug_panel.expander("🐞 Performance Debug", expanded=False):
+        show_timings = st.checkbox("Show section timings", value=debug_enabled(), key="debug_timings")
+        st.checkbox("Capture cProfile of next rerun", key="debug_cprofile")
+        st.toggle("Render only the active tab", value=True, key="lazy_tabs")
+        if show_timings:
+            st.caption(f"Last rerun: {total_ms:,.0f} ms")
+            charts = figure_cache()
+            st.caption(f"Figure cache: {len(charts)} images, {charts.hits} hits / {charts.misses} renders")
+            st.dataframe(profiler.frame(), use_container_width=True, hide_index=True)
+            if "cprofile_report" in st.session_state:
+                st.code(st.session_state["cprofile_report"], language="text")
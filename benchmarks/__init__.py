@@ -0,0 +1 @@
+"""Benchmarks for the CloudMart data layer (``python -m benchmarks.run --help``)."""
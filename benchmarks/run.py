@@ -0,0 +1,238 @@
+"""Time each dashboard stage on synthetic data and record the results as JSON.
+
+    python -m benchmarks.run --rows 10000 1000000 10000000 --out results.json
+    python -m benchmarks.run --compare before.json after.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from cloudmart import reports
+from cloudmart.compliance import TAG_FIELDS, score_completeness
+from cloudmart.cube import build_cost_cube
+from cloudmart.filters import FilterIndex
+from cloudmart.ingest import load_billing_csv
+from cloudmart.remediation import RemediationEngine
+from cloudmart.snapshot import load_snapshot
+
+from .synthetic import CARDINALITIES, write_billing_csv
+
+DEFAULT_ROWS = [10_000, 1_000_000, 10_000_000]
+
+
+def _proc_status_kb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+class RssProbe:
+    """Peak RSS per stage via Linux's resettable high-water mark (VmHWM)."""
+
+    name = "rss"
+
+    def start(self):
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return _proc_status_kb("VmRSS")
+
+    def peak_mb(self, baseline):
+        return (_proc_status_kb("VmHWM") - baseline) / 1024
+
+
+class TracemallocProbe:
+    """Peak Python-heap allocations per stage; portable but slows timed code."""
+
+    name = "tracemalloc"
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0] / 1024
+
+    def peak_mb(self, baseline):
+        return (tracemalloc.get_traced_memory()[1] / 1024 - baseline) / 1024
+
+
+def memory_probe(use_tracemalloc=False):
+    if not use_tracemalloc:
+        try:
+            probe = RssProbe()
+            probe.start()
+            return probe
+        except OSError:
+            pass
+    return TracemallocProbe()
+
+
+@contextmanager
+def stage(results, probe, name, rows):
+    """Record wall time and peak memory above the starting level of the enclosed block."""
+    baseline = probe.start()
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    peak = max(0.0, probe.peak_mb(baseline))
+    results.append({
+        "stage": name,
+        "rows": rows,
+        "seconds": round(elapsed, 6),
+        "peak_mb": round(peak, 3),
+    })
+    print(f"  {name:<24} {elapsed:9.3f}s  peak {peak:9.1f} MB", file=sys.stderr)
+
+
+def bench_size(rows, data_dir, probe, workers, missing_rate, seed, cardinalities=CARDINALITIES):
+    shape = "_".join(f"{name[0]}{cardinalities[name]}" for name in CARDINALITIES)
+    path = os.path.join(data_dir, f"cloudmart_{rows}_{missing_rate}_{seed}_{shape}.csv")
+    if not os.path.exists(path):
+        print(f"generating {path}", file=sys.stderr)
+        write_billing_csv(path, rows, missing_rate=missing_rate, seed=seed, **cardinalities)
+    print(f"{rows:,} rows", file=sys.stderr)
+    # The snapshot is a full Arrow copy of the data: removed after each size
+    with tempfile.TemporaryDirectory(prefix="cloudmart-bench-") as cache_dir:
+        return _bench_stages(path, rows, cache_dir, probe, workers)
+
+
+def _bench_stages(path, rows, cache_dir, probe, workers):
+    results = []
+    with stage(results, probe, "load_csv", rows):
+        df = load_billing_csv(path, workers=workers)
+    with stage(results, probe, "snapshot_build", rows):
+        load_snapshot(path, cache_dir, workers=workers)
+    with stage(results, probe, "snapshot_load", rows):
+        df = load_snapshot(path, cache_dir)[1]
+
+    departments = sorted(df["Department"].dropna().unique())
+    selection = {"Department": departments[: max(1, len(departments) // 2)]}
+    with stage(results, probe, "filter_index_build", rows):
+        index = FilterIndex(df)
+    with stage(results, probe, "filter_select", rows):
+        selected = index.select(selection)
+    with stage(results, probe, "filter_select_cached", rows):
+        index.select(selection)
+
+    with stage(results, probe, "tab2_cube_build", rows):
+        cube = build_cost_cube(df, workers=workers)
+    with stage(results, probe, "tab2_rollups", rows):
+        reports.cost_by_tag_status(cube, selection)
+        reports.untagged_cost_by_department(cube, selection)
+        reports.cost_by_project(cube, selection)
+        reports.cost_by_environment_and_tag(cube, selection)
+
+    with stage(results, probe, "tab3_completeness", rows):
+        completeness = score_completeness(df, TAG_FIELDS, workers=workers)
+        completeness.lowest(5)
+
+    with stage(results, probe, "tab5_engine_build", rows):
+        engine = RemediationEngine(df)
+    edited = engine.untagged().head(10_000).astype(object)
+    edited["Owner"] = "remediated@cloudmart.com"
+    with stage(results, probe, "tab5_remediation_apply", rows):
+        diff = engine.diff(edited)
+        engine.tag_counts(diff)
+
+    with stage(results, probe, "export_untagged_csv", rows):
+        reports.untagged_resources(df).to_csv(io.StringIO(), index=False)
+    with stage(results, probe, "export_remediated_csv", rows):
+        engine.materialize(diff).to_csv(io.StringIO(), index=False)
+
+    results.append({"stage": "selected_rows", "rows": rows, "value": int(len(selected))})
+    return results
+
+
+def metadata(workers):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "workers": workers,
+    }
+
+
+def compare(before_path, after_path):
+    """Print per-stage time and memory ratios (after / before)."""
+    def stages(path):
+        with open(path) as f:
+            doc = json.load(f)
+        return {(r["stage"], r["rows"]): r for r in doc["results"] if "seconds" in r}
+
+    before, after = stages(before_path), stages(after_path)
+    print(f"{'stage':<24} {'rows':>12} {'before s':>10} {'after s':>10} {'ratio':>7}")
+    for key in sorted(before.keys() & after.keys(), key=lambda k: (k[1], k[0])):
+        b, a = before[key], after[key]
+        ratio = a["seconds"] / b["seconds"] if b["seconds"] else float("nan")
+        print(f"{key[0]:<24} {key[1]:>12,} {b['seconds']:>10.3f} {a['seconds']:>10.3f} {ratio:>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "cloudmart-bench"),
+                        help="where generated CSVs are kept between runs")
+    parser.add_argument("--missing-rate", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    for name, default in CARDINALITIES.items():
+        parser.add_argument(f"--{name}", type=int, default=default,
+                            help=f"distinct {name} in generated data (default: {default})")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="measure memory with tracemalloc instead of peak RSS (inflates timings)")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two results files instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    probe = memory_probe(args.tracemalloc)
+    cardinalities = {name: getattr(args, name) for name in CARDINALITIES}
+    results = []
+    for rows in args.rows:
+        results.extend(bench_size(rows, args.data_dir, probe, args.workers, args.missing_rate, args.seed,
+                                  cardinalities))
+
+    doc = {
+        "meta": dict(metadata(args.workers), max_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024),
+        "params": dict(cardinalities, missing_rate=args.missing_rate, seed=args.seed, memory=probe.name),
+        "results": results,
+    }
+    text = json.dumps(doc, indent=1)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
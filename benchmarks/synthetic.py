@@ -0,0 +1,74 @@
+"""Synthetic CloudMart-shaped billing exports."""
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    "AccountID", "ResourceID", "Service", "Region", "Department", "Project",
+    "Environment", "Owner", "CostCenter", "CreatedBy", "MonthlyCostUSD", "Tagged",
+]
+SERVICES = ["EC2", "S3", "RDS", "Lambda", "EBS", "ECS", "DynamoDB", "CloudFront", "CloudWatch", "APIGateway"]
+REGIONS = ["us-east-1", "us-east-2", "us-west-1", "us-west-2", "eu-west-1", "ap-southeast-1"]
+ENVIRONMENTS = ["Prod", "Dev", "Test"]
+CREATORS = ["Terraform", "Jenkins", "CloudFormation", "Manual"]
+# Distinct values per high-cardinality column (generate_frame keyword -> default)
+CARDINALITIES = {"accounts": 50, "departments": 12, "projects": 60, "owners": 200}
+
+
+def generate_frame(rows, accounts=CARDINALITIES["accounts"], departments=CARDINALITIES["departments"],
+                   projects=CARDINALITIES["projects"], owners=CARDINALITIES["owners"],
+                   missing_rate=0.3, seed=0, start=0):
+    """A billing frame with the sample file's schema.
+
+    ``missing_rate`` is the share of resources missing at least one tag
+    (always Owner, sometimes Department/Project/Environment too); those rows
+    are marked ``Tagged = No``. ResourceIDs are numbered from ``start``.
+    """
+    rng = np.random.default_rng(seed)
+
+    def pick(choices):
+        choices = np.asarray(choices, dtype=object)
+        return choices[rng.integers(0, len(choices), rows)]
+
+    account = rng.integers(0, accounts, rows)
+    department = rng.integers(0, departments, rows)
+    frame = pd.DataFrame({
+        "AccountID": (1001 + account).astype(str),
+        "ResourceID": [f"r-{i:09d}" for i in range(start, start + rows)],
+        "Service": pick(SERVICES),
+        "Region": pick(REGIONS),
+        "Department": np.char.add("Dept", department.astype(str)).astype(object),
+        "Project": np.char.add("Proj", rng.integers(0, projects, rows).astype(str)).astype(object),
+        "Environment": pick(ENVIRONMENTS),
+        "Owner": np.char.add(np.char.add("user", rng.integers(0, owners, rows).astype(str)),
+                             "@cloudmart.com").astype(object),
+        "CostCenter": np.char.add("CC", (100 + department).astype(str)).astype(object),
+        "CreatedBy": pick(CREATORS),
+        "MonthlyCostUSD": np.round(rng.lognormal(4, 1, rows), 2),
+    })
+
+    missing = rng.random(rows) < missing_rate
+    frame.loc[missing, "Owner"] = None
+    for col in ("Department", "Project", "Environment"):
+        frame.loc[missing & (rng.random(rows) < 0.1), col] = None
+    frame["Tagged"] = np.where(missing, "No", "Yes")
+    return frame[COLUMNS]
+
+
+def write_billing_csv(path, rows, chunk_rows=1_000_000, quote_lines=True, seed=0, **kwargs):
+    """Write ``rows`` synthetic rows to ``path`` in chunks.
+
+    ``quote_lines`` wraps every record in one pair of quotes like the
+    sample ``cloudmart_multi_account.csv``.
+    """
+    def fmt(text):
+        if not quote_lines:
+            return text
+        return "".join(f'"{line}"\n' for line in text.splitlines())
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(fmt(",".join(COLUMNS)))
+        for i, start in enumerate(range(0, rows, chunk_rows)):
+            chunk = generate_frame(min(chunk_rows, rows - start), seed=seed + i, start=start, **kwargs)
+            f.write(fmt(chunk.to_csv(index=False, header=False)))
+    return path
@@ -0,0 +1,12 @@
+"""Data layer for the CloudMart tagging dashboard."""
+
+from .ingest import iter_billing_chunks, load_billing_csv
+from .snapshot import Fingerprint, fingerprint, load_snapshot
+
+__all__ = [
+    "Fingerprint",
+    "fingerprint",
+    "iter_billing_chunks",
+    "load_billing_csv",
+    "load_snapshot",
+]
@@ -0,0 +1,71 @@
+"""Bounded, pre-aggregated series for the Plotly charts.
+
+Every helper returns at most ``max_points`` rows regardless of how many
+resources were loaded, so figure payloads stay constant in size.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+MAX_POINTS_ENV = "CLOUDMART_MAX_CHART_POINTS"
+OTHER_LABEL = "Other"
+
+
+def default_max_points():
+    """Per-figure point cap from ``CLOUDMART_MAX_CHART_POINTS`` (default 50)."""
+    return max(2, int(os.environ.get(MAX_POINTS_ENV, "50")))
+
+
+def top_n(frame, label, value, max_points=None, other_label=OTHER_LABEL):
+    """Sum ``value`` per ``label``; keep the largest and fold the rest into ``Other``."""
+    max_points = max_points or default_max_points()
+    totals = frame.groupby(label, observed=True)[value].sum().sort_values(ascending=False)
+    if len(totals) > max_points:
+        rest = totals.iloc[max_points - 1:].sum()
+        totals = totals.iloc[:max_points - 1]
+        totals = pd.concat([totals.rename(index=str), pd.Series({other_label: rest})])
+    return totals.rename_axis(label).reset_index(name=value)
+
+
+def top_n_grouped(frame, label, series, value, max_points=None, other_label=OTHER_LABEL):
+    """Like ``top_n`` for a ``label`` x ``series`` chart (e.g. grouped bars).
+
+    Labels are ranked by their total across series; the cap applies to the
+    number of bars, i.e. labels x series.
+    """
+    max_points = max_points or default_max_points()
+    n_series = max(1, frame[series].nunique())
+    keep_labels = max(1, max_points // n_series)
+    totals = frame.groupby(label, observed=True)[value].sum().sort_values(ascending=False)
+    grouped = frame.groupby([label, series], observed=True)[value].sum().reset_index()
+    if len(totals) <= keep_labels:
+        return grouped
+    rank = {name: i for i, name in enumerate(totals.index[:keep_labels - 1])}
+    grouped[label] = grouped[label].astype(object).where(grouped[label].isin(rank.keys()), other_label)
+    grouped = grouped.groupby([label, series], sort=False)[value].sum().reset_index()
+    order = grouped[label].map(rank).fillna(len(rank))
+    return grouped.iloc[np.argsort(order.to_numpy(), kind="stable")].reset_index(drop=True)
+
+
+def histogram(values, max_bins=None):
+    """Bin ``values`` server-side; returns bin edges and counts (nulls ignored)."""
+    max_bins = max_bins or default_max_points()
+    values = pd.Series(values).dropna().to_numpy(dtype="float64")
+    if len(values) == 0:
+        return pd.DataFrame({"BinStart": [], "BinEnd": [], "Count": []})
+    counts, edges = np.histogram(values, bins=min(max_bins, max(1, len(np.unique(values)))))
+    return pd.DataFrame({"BinStart": edges[:-1], "BinEnd": edges[1:], "Count": counts})
+
+
+def figure_points(fig):
+    """Points a Plotly figure sends to the browser, over all traces."""
+    points = 0
+    for trace in fig.data:
+        for attr in ("values", "x", "y"):
+            data = getattr(trace, attr, None)
+            if data is not None:
+                points += len(data)
+                break
+    return points
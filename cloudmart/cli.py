@@ -0,0 +1,84 @@
+"""Headless batch mode: ``python -m cloudmart report <inputs> --out <dir>``."""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from functools import partial
+
+from .ingest import concat_chunks, load_billing_csv
+from .parallel import default_workers, map_tasks
+from .reports import build_reports
+
+FORMATS = ("csv", "json", "parquet")
+
+
+def expand_inputs(inputs):
+    """Billing CSV paths from files and directories (``*.csv`` inside)."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(glob.glob(os.path.join(item, "*.csv"))))
+        else:
+            paths.append(item)
+    return paths
+
+
+def write_table(df, path, fmt):
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "json":
+        df.to_json(path, orient="records", indent=1)
+    else:
+        df.to_parquet(path, index=False)
+
+
+def run_report(inputs, out_dir, formats=("csv",), workers=None):
+    """Load ``inputs`` once and write every report in each of ``formats``."""
+    paths = expand_inputs(inputs)
+    if not paths:
+        raise FileNotFoundError(f"No billing CSV files found in {inputs}")
+    workers = default_workers() if workers is None else workers
+    # Many files: one file per worker. A single file: split it by byte range.
+    if len(paths) > 1:
+        frames = map_tasks(partial(load_billing_csv, workers=1), paths, workers)
+    else:
+        frames = [load_billing_csv(paths[0], workers=workers)]
+    df = concat_chunks(frames)
+
+    tables, summary = build_reports(df, workers=workers)
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for name, table in tables.items():
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{name}.{fmt}")
+            write_table(table, path, fmt)
+            written.append(path)
+    summary_path = os.path.join(out_dir, "summary.json")
+    with open(summary_path, "w") as f:
+        json.dump(dict(summary, sources=paths), f, indent=1)
+    written.append(summary_path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cloudmart", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    report = commands.add_parser("report", help="write every Task Set report for a set of billing files")
+    report.add_argument("inputs", nargs="+", help="billing CSV files or directories of them")
+    report.add_argument("--out", required=True, help="output directory")
+    report.add_argument("--format", dest="formats", action="append", choices=FORMATS,
+                        help="output format; repeat for several (default: csv)")
+    report.add_argument("--workers", type=int, default=None,
+                        help="process-pool size (default: CLOUDMART_WORKERS or 1)")
+    args = parser.parse_args(argv)
+
+    written = run_report(args.inputs, args.out, tuple(args.formats or ["csv"]), args.workers)
+    for path in written:
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Pre-aggregated cost cube for the Tab 2 / Tab 4 rollups."""
+
+from functools import partial
+
+import pandas as pd
+
+from .ingest import COST_COLUMN, concat_chunks
+from .parallel import map_tasks, row_slices
+
+CUBE_DIMENSIONS = ["Department", "Project", "Environment", "Service", "Region", "Tagged"]
+COUNT_COLUMN = "ResourceCount"
+
+
+def build_cost_cube(df, dimensions=CUBE_DIMENSIONS, workers=None):
+    """Sum MonthlyCostUSD and count resources per combination of ``dimensions``.
+
+    Null dimension values are kept as their own group so that the cube
+    totals match the raw frame; ``rollup`` drops them like a plain groupby.
+    Large frames are aggregated per row slice (in parallel with
+    ``workers > 1``) and the partial cubes merged.
+    """
+    slices = row_slices(df)
+    if len(slices) == 1:
+        return partial_cube(df, dimensions)
+    return merge_cubes(map_tasks(partial(partial_cube, dimensions=dimensions), slices, workers))
+
+
+def partial_cube(df, dimensions=CUBE_DIMENSIONS):
+    """Cube of one partition or row slice."""
+    dims = [col for col in dimensions if col in df.columns]
+    # Accumulate in float64: summing millions of float32 costs loses cents.
+    grouped = df[COST_COLUMN].astype("float64").groupby(
+        [df[col] for col in dims], observed=True, dropna=False, sort=False
+    )
+    cube = pd.DataFrame({COST_COLUMN: grouped.sum(), COUNT_COLUMN: grouped.size()})
+    return cube.reset_index()
+
+
+def merge_cubes(parts):
+    """Merge partial cubes by re-summing cells that share dimension values."""
+    cube = concat_chunks(parts)
+    dims = [col for col in cube.columns if col not in (COST_COLUMN, COUNT_COLUMN)]
+    merged = cube.groupby(dims, observed=True, dropna=False, sort=False)[[COST_COLUMN, COUNT_COLUMN]].sum()
+    return merged.reset_index()
+
+
+def filter_mask(cube, filters):
+    """Boolean mask of cube cells matching ``{column: allowed values}``."""
+    mask = pd.Series(True, index=cube.index)
+    for col, values in (filters or {}).items():
+        if values is not None and col in cube.columns:
+            mask &= cube[col].isin(values)
+    return mask
+
+
+def rollup(cube, by, filters=None):
+    """Roll the cube up to ``by`` under ``filters``; returns cost and count columns."""
+    cells = cube[filter_mask(cube, filters)]
+    by = [by] if isinstance(by, str) else list(by)
+    measures = [COST_COLUMN, COUNT_COLUMN]
+    if not by:
+        return cells[measures].sum().to_frame().T
+    return cells.groupby(by, observed=True)[measures].sum().reset_index()
+
+
+def distinct_values(cube, col, filters=None):
+    """Sorted non-null values of ``col`` present under ``filters``."""
+    return sorted(cube.loc[filter_mask(cube, filters), col].dropna().unique())
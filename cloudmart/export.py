@@ -0,0 +1,134 @@
+"""On-demand, chunked file exports (CSV, gzip CSV, Parquet).
+
+Exports are written chunk by chunk straight to a file under the cache
+directory, so at most one chunk of output is in memory while writing.
+Files are named by a key (dataset version, filters, diff, ...): a
+repeated download of unchanged data reads the existing file.
+"""
+
+import gzip
+import hashlib
+import io
+import os
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .files import atomic_path, evict_lru
+from .ingest import TAG_LABELS, TAGGED_COLUMN
+from .snapshot import DEFAULT_CACHE_DIR
+
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_MAX_FILES = 32
+
+# format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+
+def frame_chunks(df, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Consecutive row slices of ``df`` (views, not copies)."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def export_labels(chunk):
+    """Write Tagged as ``Yes``/``No`` like the source CSV."""
+    if TAGGED_COLUMN in chunk.columns:
+        return chunk.assign(**{TAGGED_COLUMN: chunk[TAGGED_COLUMN].map(TAG_LABELS)})
+    return chunk
+
+
+def write_csv(chunks, f):
+    """Write ``chunks`` to the text stream ``f``; the header comes from the first."""
+    header = True
+    for chunk in chunks:
+        export_labels(chunk).to_csv(f, index=False, header=header)
+        header = False
+
+
+def write_parquet(chunks, path):
+    """Write ``chunks`` as row groups of one Parquet file."""
+    writer = None
+    try:
+        for chunk in chunks:
+            chunk = export_labels(chunk)
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_export(chunks, path, fmt):
+    """Stream ``chunks`` to ``path`` in ``fmt``; the file appears atomically."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {sorted(EXPORT_FORMATS)}")
+    with atomic_path(path) as tmp:
+        if fmt == "parquet":
+            write_parquet(chunks, tmp)
+        elif fmt == "csv.gz":
+            # No name or mtime in the header keeps the output byte-identical for identical data
+            with open(tmp, "wb") as raw, gzip.GzipFile("", "wb", fileobj=raw, mtime=0) as gz, \
+                    io.TextIOWrapper(gz, encoding="utf-8", newline="") as f:
+                write_csv(chunks, f)
+        else:
+            with open(tmp, "w", encoding="utf-8", newline="") as f:
+                write_csv(chunks, f)
+    return path
+
+
+def export_key(*parts):
+    """Short stable file key from version strings, filter keys, digests..."""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+
+
+class ExportCache:
+    """Export files on disk, at most ``max_files`` (least recently used go first)."""
+
+    def __init__(self, cache_dir=os.path.join(DEFAULT_CACHE_DIR, "exports"), max_files=DEFAULT_MAX_FILES):
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def path(self, name, key, fmt):
+        return os.path.join(self.cache_dir, f"{name}-{key}{EXPORT_FORMATS[fmt][0]}")
+
+    def build(self, name, key, fmt, chunks):
+        """Path of the ``name``/``key`` export, writing it from ``chunks()`` if missing.
+
+        ``chunks`` is a callable returning an iterable of DataFrames, only
+        called on a cache miss.
+        """
+        path = self.path(name, key, fmt)
+        # One lock per file: a slow export only holds up requests for itself;
+        # write_export's atomic replace keeps readers off half-written files
+        with self._lock:
+            lock = self._locks.setdefault(path, threading.Lock())
+        with lock:
+            if os.path.exists(path):
+                os.utime(path)
+                return path
+            os.makedirs(self.cache_dir, exist_ok=True)
+            write_export(chunks(), path, fmt)
+        with self._lock:
+            self._evict()
+        return path
+
+    def read(self, name, key, fmt, chunks):
+        """Bytes of the export (see ``build``)."""
+        with open(self.build(name, key, fmt, chunks), "rb") as f:
+            return f.read()
+
+    def _evict(self):
+        for stale in evict_lru(self.cache_dir, self.max_files):
+            self._locks.pop(stale, None)
@@ -0,0 +1,83 @@
+"""Rendered matplotlib charts cached by the hash of their input data.
+
+Figures are built with ``matplotlib.figure.Figure`` rather than pyplot, so
+nothing is registered in pyplot's global figure manager. Each figure is
+closed right after it is saved, and the cache only keeps the encoded
+PNG/SVG output, bounded by an LRU.
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+DEFAULT_CACHE_SIZE = 64
+# Same output settings st.pyplot uses, so cached images look identical
+SAVEFIG_KWARGS = {"bbox_inches": "tight", "dpi": 200}
+
+
+def input_digest(*inputs):
+    """Stable digest of the chart inputs (DataFrames, Series or plain values)."""
+    h = hashlib.sha1()
+    for item in inputs:
+        if isinstance(item, (pd.DataFrame, pd.Series)):
+            columns = list(item.columns) if isinstance(item, pd.DataFrame) else [item.name]
+            h.update(repr((type(item).__name__, columns, len(item))).encode())
+            h.update(pd.util.hash_pandas_object(item, index=True).to_numpy().tobytes())
+        else:
+            h.update(repr(item).encode())
+    return h.hexdigest()
+
+
+def render_figure(draw, figsize, fmt="png"):
+    """Draw on a fresh Figure and return the encoded bytes (SVG as ``str``)."""
+    fig = Figure(figsize=figsize)
+    try:
+        draw(fig)
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, **SAVEFIG_KWARGS)
+    finally:
+        fig.clear()
+    data = buf.getvalue()
+    return data.decode("utf-8") if fmt == "svg" else data
+
+
+class FigureCache:
+    """LRU of rendered charts keyed by ``(name, format, size, input digest)``.
+
+    ``draw(fig)`` is only called on a miss, receives an empty Figure and adds
+    its own axes. Safe to share between sessions.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, name, inputs, draw, figsize, fmt="png"):
+        key = (name, fmt, figsize, input_digest(*inputs))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        image = render_figure(draw, figsize, fmt)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = image
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return image
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,51 @@
+"""Atomic file writes and size-bounded cache directories for the on-disk caches."""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+TMP_SUFFIX = ".tmp"
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a temp path that replaces ``path`` when the block succeeds.
+
+    The temp file is unique per call (dashboard sessions are threads of one
+    process) and sits next to ``path``, so ``os.replace`` is atomic: readers
+    see the old file or the complete new one. On error it is removed.
+    """
+    fd, tmp = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=TMP_SUFFIX,
+                               dir=os.path.dirname(path) or ".")
+    os.close(fd)
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def evict_lru(directory, max_files, suffix=""):
+    """Remove the least recently modified files beyond ``max_files``; returns their paths.
+
+    Only names ending in ``suffix`` count; in-flight temp files never do.
+    Files removed concurrently by another session are skipped.
+    """
+    files = []
+    for name in os.listdir(directory):
+        if name.endswith(suffix) and not name.endswith(TMP_SUFFIX):
+            full = os.path.join(directory, name)
+            try:
+                files.append((os.path.getmtime(full), full))
+            except FileNotFoundError:
+                pass
+    files.sort()
+    removed = []
+    for _, stale in files[:max(0, len(files) - max_files)]:
+        try:
+            os.remove(stale)
+            removed.append(stale)
+        except FileNotFoundError:
+            pass
+    return removed
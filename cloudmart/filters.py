@@ -0,0 +1,87 @@
+"""Index-based filter engine for the sidebar and dashboard selections."""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ["Department", "Project", "Environment", "Service", "Region"]
+
+
+def selection_key(filters):
+    """Hashable, order-insensitive key for ``{column: values}`` (None = unfiltered)."""
+    return tuple(sorted(
+        (col, frozenset(values)) for col, values in filters.items() if values is not None
+    ))
+
+
+class FilterIndex:
+    """Sorted row-index postings per value of each filter column.
+
+    ``select`` turns ``{column: allowed values}`` into a sorted array of row
+    positions by intersecting postings, without scanning or copying the
+    frame. Results are kept in a small LRU keyed by the selection, so an
+    unchanged filter state is a dictionary lookup.
+    """
+
+    def __init__(self, df, columns=FILTER_COLUMNS, cache_size=32):
+        self.n_rows = len(df)
+        self._postings = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            values = df[col]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype("category")
+            codes = values.cat.codes.to_numpy()
+            # Slot 0 holds null rows (code -1); slot i + 1 holds category i.
+            counts = np.bincount(codes + 1, minlength=len(values.cat.categories) + 1)
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            order = np.argsort(codes, kind="stable")
+            self._postings[col] = (values.cat.categories, order, offsets)
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def values(self, col):
+        """Sorted values of ``col`` that occur in at least one row."""
+        categories, _, offsets = self._postings[col]
+        present = np.diff(offsets)[1:] > 0
+        return sorted(categories[present])
+
+    def rows_for(self, col, values):
+        """Sorted row positions where ``col`` is in ``values``; None means every row."""
+        categories, order, offsets = self._postings[col]
+        codes = categories.get_indexer(list(values))
+        codes = np.unique(codes[codes >= 0])
+        if offsets[1] == 0 and len(codes) == len(categories):
+            return None
+        rows = [order[offsets[code + 1]:offsets[code + 2]] for code in codes]
+        if not rows:
+            return np.empty(0, dtype=order.dtype)
+        return np.sort(np.concatenate(rows)) if len(rows) > 1 else rows[0]
+
+    def select(self, filters):
+        """Row positions matching every ``{column: values}`` constraint (read-only)."""
+        key = selection_key({col: values for col, values in filters.items() if col in self._postings})
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        postings = [self.rows_for(col, values) for col, values in key]
+        postings = sorted((rows for rows in postings if rows is not None), key=len)
+        if not postings:
+            rows = np.arange(self.n_rows)
+        else:
+            rows = postings[0]
+            for other in postings[1:]:
+                rows = np.intersect1d(rows, other, assume_unique=True)
+        rows.flags.writeable = False
+
+        with self._lock:
+            self._cache[key] = rows
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return rows
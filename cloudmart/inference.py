@@ -0,0 +1,172 @@
+"""Suggested values for missing tags (Task Set 5), learned from fully tagged rows.
+
+One naive Bayes classifier per tag is trained on the resources that carry
+every required tag. Its features are AccountID, the ResourceID prefix,
+Service, Region and the other tags. Each feature is encoded as an integer
+code against the training categories, with 0 meaning missing, rare or
+unseen, and fed to the model as a sparse one-hot matrix. With exactly one
+active column per feature, MultinomialNB gives the categorical naive Bayes
+posterior, but fits with one sparse product instead of a pass per class.
+
+Suggestions have the same ``row``/``column``/``value`` layout as a
+remediation diff, plus a ``confidence`` column, so accepted suggestions
+merge straight into the diff.
+"""
+
+import hashlib
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.naive_bayes import MultinomialNB
+
+from .compliance import present, presence_matrix
+from .files import atomic_path, evict_lru
+from .remediation import REQUIRED_TAGS
+from .snapshot import DEFAULT_CACHE_DIR
+
+BASE_FEATURES = ["AccountID", "ResourcePrefix", "Service", "Region"]
+CONFIDENCE_COLUMN = "confidence"
+DEFAULT_MIN_CONFIDENCE = 0.6
+TRAIN_ROWS = 500_000
+MIN_CATEGORY_COUNT = 2
+MAX_CATEGORIES = 1_000
+PREDICT_BATCH = 50_000
+MAX_MODEL_FILES = 8
+
+
+def resource_prefix(ids):
+    """``ec2`` for ``ec2-004``: the resource type encoded in the ID."""
+    return ids.astype(str).str.replace(r"-.*$", "", regex=True)
+
+
+def feature_source(df, column):
+    return resource_prefix(df["ResourceID"]) if column == "ResourcePrefix" else df[column]
+
+
+def encode(values, categories):
+    """Codes 1..n against ``categories``; 0 for missing or unseen values."""
+    codes = pd.Index(categories).get_indexer(values.astype(str)).astype(np.int64) + 1
+    codes[~present(values)] = 0
+    return codes
+
+
+def frequent_categories(values):
+    """Training categories of one feature: frequent values only, so IDs don't explode."""
+    counts = values[present(values)].astype(str).value_counts()
+    counts = counts[counts >= MIN_CATEGORY_COUNT].head(MAX_CATEGORIES)
+    return pd.Index(counts.index, dtype=object)
+
+
+def one_hot(codes, sizes):
+    """Sparse one-hot matrix for columns of codes (``sizes[i]`` values each)."""
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    indices = (codes + offsets).ravel()
+    indptr = np.arange(0, indices.size + 1, codes.shape[1])
+    data = np.ones(indices.size, dtype=np.float32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(codes.shape[0], int(np.sum(sizes))))
+
+
+class TagSuggester:
+    """Per-tag classifiers that predict missing tags with a confidence score."""
+
+    def __init__(self, targets=REQUIRED_TAGS, alpha=0.1, train_rows=TRAIN_ROWS, seed=0):
+        self.targets = list(targets)
+        self.alpha = alpha
+        self.train_rows = train_rows
+        self.seed = seed
+        self.categories = {}
+        self.models = {}
+
+    def features(self, target):
+        return BASE_FEATURES + [tag for tag in self.targets if tag != target]
+
+    def fit(self, df):
+        """Train on rows carrying every target tag (sampled down to ``train_rows``)."""
+        self.targets = [tag for tag in self.targets if tag in df.columns]
+        complete = np.flatnonzero(presence_matrix(df, self.targets).all(axis=1))
+        if len(complete) > self.train_rows:
+            rng = np.random.default_rng(self.seed)
+            complete = np.sort(rng.choice(complete, self.train_rows, replace=False))
+        train = df.iloc[complete]
+
+        codes = {}
+        for col in BASE_FEATURES + self.targets:
+            values = feature_source(train, col)
+            self.categories[col] = frequent_categories(values)
+            codes[col] = encode(values, self.categories[col])
+
+        self.models = {}
+        for target in self.targets:
+            known = codes[target] > 0
+            if len(np.unique(codes[target][known])) < 2:
+                continue  # nothing to choose between
+            X = self._matrix(codes, target)[known]
+            self.models[target] = MultinomialNB(alpha=self.alpha).fit(X, codes[target][known])
+        return self
+
+    def _matrix(self, codes, target):
+        feats = self.features(target)
+        return one_hot(np.column_stack([codes[f] for f in feats]), [len(self.categories[f]) + 1 for f in feats])
+
+    def suggest(self, df, rows=None):
+        """Best value and confidence for every missing target tag in ``df``.
+
+        ``rows`` limits the pass to those row positions (e.g. the untagged
+        ones); the ``row`` column always holds positions in ``df``.
+        """
+        rows = np.arange(len(df)) if rows is None else np.asarray(rows, dtype=np.int64)
+        subset = df.iloc[rows]
+        codes = {}
+        parts = []
+        for target, model in self.models.items():
+            missing = ~present(subset[target])
+            if not missing.any():
+                continue
+            for f in self.features(target):
+                if f not in codes:
+                    codes[f] = encode(feature_source(subset, f), self.categories[f])
+            X = self._matrix(codes, target)[np.flatnonzero(missing)]
+            best = np.empty(X.shape[0], dtype=np.int64)
+            confidence = np.empty(X.shape[0])
+            for start in range(0, X.shape[0], PREDICT_BATCH):
+                proba = model.predict_proba(X[start:start + PREDICT_BATCH])
+                best[start:start + PREDICT_BATCH] = proba.argmax(axis=1)
+                confidence[start:start + PREDICT_BATCH] = proba.max(axis=1)
+            labels = self.categories[target].to_numpy(dtype=object)[model.classes_[best] - 1]
+            parts.append(pd.DataFrame({
+                "row": rows[missing],
+                "column": target,
+                "value": labels,
+                CONFIDENCE_COLUMN: confidence,
+            }))
+        if not parts:
+            return pd.DataFrame({"row": np.empty(0, dtype=np.int64), "column": [], "value": [],
+                                 CONFIDENCE_COLUMN: np.empty(0)})
+        return pd.concat(parts, ignore_index=True)
+
+
+def load_suggester(df, version, targets=REQUIRED_TAGS, cache_dir=DEFAULT_CACHE_DIR, max_files=MAX_MODEL_FILES):
+    """``TagSuggester`` for this dataset version and tags, trained once and kept on disk.
+
+    Every partition selection is its own version, so only the ``max_files``
+    most recently used models are kept.
+    """
+    tags = hashlib.sha256("\n".join(targets).encode()).hexdigest()[:8]
+    model_dir = os.path.join(cache_dir, "models")
+    path = os.path.join(model_dir, f"tags-{version[:16]}-{tags}.joblib")
+    if os.path.exists(path):
+        try:
+            suggester = joblib.load(path)
+            os.utime(path)
+            return suggester
+        except Exception:
+            pass  # unreadable (e.g. other sklearn version): retrain below
+    suggester = TagSuggester(targets).fit(df)
+    os.makedirs(model_dir, exist_ok=True)
+    with atomic_path(path) as tmp:
+        joblib.dump(suggester, tmp)
+    evict_lru(model_dir, max_files, suffix=".joblib")
+    return suggester
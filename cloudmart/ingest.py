@@ -0,0 +1,148 @@
+"""Streaming, typed loader for CloudMart billing exports."""
+
+import csv
+import io
+import os
+from functools import partial
+from itertools import islice
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .parallel import default_workers, map_tasks
+
+# ----------------------------------------------------------
+# SCHEMA
+# ----------------------------------------------------------
+CATEGORY_COLUMNS = ["AccountID", "Service", "Region", "Department", "Project", "Environment", "CostCenter"]
+COST_COLUMN = "MonthlyCostUSD"
+TAGGED_COLUMN = "Tagged"
+
+DTYPES = {col: "category" for col in CATEGORY_COLUMNS}
+# Read as text and coerced in _parse_chunk: a malformed cost ("N/A",
+# "$12.50") becomes null instead of failing the whole load
+DTYPES[COST_COLUMN] = "str"
+DTYPES[TAGGED_COLUMN] = "category"
+
+TAGGED_VALUES = {"yes": True, "no": False}
+TAG_LABELS = {True: "Yes", False: "No"}
+
+DEFAULT_CHUNK_ROWS = 250_000
+DEFAULT_RANGE_BYTES = 64 << 20
+
+
+def _unwrap(line):
+    # Some exports wrap every record in a single pair of quotes
+    # ("1001,i-001,EC2,...,Yes"); strip those so the tokenizer sees the fields.
+    line = line.strip()
+    if len(line) > 1 and line[0] == '"' and line[-1] == '"' and line.count('"') == 2:
+        return line[1:-1]
+    return line
+
+
+def read_header(f):
+    """Return the column names from the first non-empty line of ``f``."""
+    for line in f:
+        line = _unwrap(line)
+        if line:
+            return next(csv.reader([line]))
+    return []
+
+
+def _parse_chunk(lines, columns):
+    chunk = pd.read_csv(
+        io.StringIO("\n".join(lines)),
+        header=None,
+        names=columns,
+        dtype={col: dtype for col, dtype in DTYPES.items() if col in columns},
+        keep_default_na=False,
+        na_values=[""],
+        skipinitialspace=True,
+        engine="c",
+    )
+    if COST_COLUMN in chunk.columns:
+        chunk[COST_COLUMN] = pd.to_numeric(chunk[COST_COLUMN], errors="coerce").astype("float32")
+    if TAGGED_COLUMN in chunk.columns:
+        # Map the (few) distinct Yes/No spellings rather than every cell.
+        tagged = chunk[TAGGED_COLUMN]
+        lookup = {cat: TAGGED_VALUES.get(str(cat).strip().lower()) for cat in tagged.cat.categories}
+        chunk[TAGGED_COLUMN] = tagged.map(lookup).astype("boolean")
+    return chunk
+
+
+def iter_billing_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield typed DataFrame chunks of at most ``chunk_rows`` rows from ``path``."""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        columns = [str(col).strip() for col in read_header(f)]
+        while True:
+            raw = list(islice(f, chunk_rows))
+            if not raw:
+                break
+            lines = [line for line in map(_unwrap, raw) if line]
+            if lines:
+                yield _parse_chunk(lines, columns)
+
+
+def byte_ranges(path, range_bytes=DEFAULT_RANGE_BYTES):
+    """Header columns plus ``(start, end)`` byte ranges that split the body on line boundaries."""
+    with open(path, "rb") as f:
+        columns = []
+        while not columns:
+            line = f.readline()
+            if not line:
+                break
+            line = _unwrap(line.decode("utf-8-sig"))
+            if line:
+                columns = [col.strip() for col in next(csv.reader([line]))]
+        start, size = f.tell(), os.fstat(f.fileno()).st_size
+        ranges = []
+        while start < size:
+            f.seek(min(start + range_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return columns, ranges
+
+
+def parse_byte_range(path, columns, byte_range):
+    """Parse the complete lines in ``byte_range`` of ``path``."""
+    start, end = byte_range
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    lines = [line for line in map(_unwrap, text.splitlines()) if line]
+    return _parse_chunk(lines, columns) if lines else None
+
+
+def concat_chunks(chunks):
+    """Concatenate typed chunks, unioning categoricals so they stay compact.
+
+    Categories are sorted, so the result does not depend on how the input
+    was chunked (serial line batches vs. parallel byte ranges).
+    """
+    chunks = [chunk for chunk in chunks if chunk is not None]
+    if not chunks:
+        return pd.DataFrame()
+    columns = {}
+    for col in chunks[0].columns:
+        parts = [chunk[col] for chunk in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[col] = pd.Series(union_categoricals(parts, sort_categories=True), name=col)
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def load_billing_csv(path, chunk_rows=DEFAULT_CHUNK_ROWS, workers=None, range_bytes=DEFAULT_RANGE_BYTES):
+    """Load a billing CSV into a compact, typed DataFrame.
+
+    With ``workers > 1`` the body is split into byte ranges that are parsed
+    in a process pool; the result is identical to the serial path.
+    ``workers=None`` uses ``CLOUDMART_WORKERS``.
+    """
+    workers = default_workers() if workers is None else workers
+    if workers <= 1:
+        return concat_chunks(iter_billing_chunks(path, chunk_rows))
+    columns, ranges = byte_ranges(path, range_bytes)
+    return concat_chunks(map_tasks(partial(parse_byte_range, path, columns), ranges, workers))
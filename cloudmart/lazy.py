@@ -0,0 +1,25 @@
+"""Per-section memoization for deferred tab rendering."""
+
+
+class SectionMemo:
+    """Keeps the latest result of each named section.
+
+    ``get(section, key, compute)`` returns the stored result while ``key``
+    (dataset version, filter selection, ...) is unchanged and recomputes it
+    otherwise. ``store`` is any mutable mapping, e.g. a per-session dict, so
+    memory is bounded by one entry per section.
+    """
+
+    def __init__(self, store):
+        self._store = store
+
+    def get(self, section, key, compute):
+        hit = self._store.get(section)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        value = compute()
+        self._store[section] = (key, value)
+        return value
+
+    def clear(self):
+        self._store.clear()
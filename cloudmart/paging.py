@@ -0,0 +1,46 @@
+"""Server-side search, sort and pagination over row positions.
+
+Large result sets stay on the server; only the rows of the visible page
+are sliced out and sent to the browser.
+"""
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = (25, 100, 500)
+
+
+def search_positions(df, text, columns=None, positions=None):
+    """Positions (within ``positions``) whose ``columns`` contain ``text``, ignoring case."""
+    positions = np.arange(len(df)) if positions is None else np.asarray(positions, dtype=np.int64)
+    text = (text or "").strip()
+    if not text:
+        return positions
+    hit = np.zeros(len(positions), dtype=bool)
+    for col in columns or df.columns:
+        values = df[col].iloc[positions]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Match each category once, then broadcast through the codes
+            matched = values.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+            hit |= np.append(np.asarray(matched, dtype=bool), False)[values.cat.codes.to_numpy()]
+        else:
+            hit |= values.astype(str).str.contains(text, case=False, regex=False).to_numpy(dtype=bool)
+    return positions[hit]
+
+
+def sort_positions(df, positions, column, ascending=True):
+    """``positions`` reordered by ``df[column]`` (stable; missing values last)."""
+    positions = np.asarray(positions, dtype=np.int64)
+    if column is None:
+        return positions
+    values = df[column].iloc[positions].reset_index(drop=True)
+    order = values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+    return positions[order]
+
+
+def page_bounds(total, page, size):
+    """``(start, stop, n_pages)`` for 1-based ``page``, clamped to the last page."""
+    n_pages = max(1, -(-total // size))
+    page = min(max(1, page), n_pages)
+    start = (page - 1) * size
+    return start, min(start + size, total), n_pages
@@ -0,0 +1,38 @@
+"""Process-pool execution shared by ingestion and aggregation."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+WORKERS_ENV = "CLOUDMART_WORKERS"
+
+# Aggregations split frames into fixed-size row slices (independent of the
+# worker count) so every worker count produces bit-identical merged results.
+SLICE_ROWS = 1_000_000
+
+
+def default_workers():
+    """Worker count from ``CLOUDMART_WORKERS`` (``auto`` = all cores; default 1 = serial)."""
+    value = os.environ.get(WORKERS_ENV, "1").strip().lower()
+    if value in ("auto", "0"):
+        return os.cpu_count() or 1
+    return max(1, int(value))
+
+
+def row_slices(df, rows=SLICE_ROWS):
+    """Consecutive ``rows``-sized slices of ``df`` (at least one)."""
+    return [df.iloc[start:start + rows] for start in range(0, len(df), rows)] or [df]
+
+
+def map_tasks(fn, items, workers=None):
+    """``[fn(item) for item in items]``, fanned out over a process pool.
+
+    Results keep the order of ``items``. With one worker (or one item) the
+    tasks run inline, so the serial and parallel paths execute the same
+    per-task code and merge the same partial results.
+    """
+    items = list(items)
+    workers = default_workers() if workers is None else workers
+    if workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ProcessPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(fn, items))
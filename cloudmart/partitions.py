@@ -0,0 +1,199 @@
+"""Partitioned storage for directories of per-account, per-month billing exports.
+
+Layout::
+
+    <store>/AccountID=<id>/BillingMonth=<YYYY-MM>/<source>-<path hash>-<hash>.arrow
+    <store>/_manifest.json
+
+The manifest maps each ingested source file to its fingerprint and the
+partition files it produced, so re-ingesting a directory only parses new or
+changed exports and never rewrites existing months.
+"""
+
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import re
+from functools import partial
+
+import pandas as pd
+
+from .files import atomic_path
+from .ingest import concat_chunks, load_billing_csv
+from .parallel import map_tasks
+from .snapshot import Fingerprint, read_table, refresh_fingerprint, source_key, write_table
+
+MONTH_COLUMN = "BillingMonth"
+MANIFEST_NAME = "_manifest.json"
+
+_MONTH_IN_NAME = re.compile(r"(20\d{2})[-_]?(0[1-9]|1[0-2])(?!\d)")
+
+
+def billing_month_from_name(path):
+    """``YYYY-MM`` found in the file name, or None."""
+    match = _MONTH_IN_NAME.search(os.path.basename(path))
+    return f"{match.group(1)}-{match.group(2)}" if match else None
+
+
+def _read_manifest(store_dir):
+    try:
+        with open(os.path.join(store_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(store_dir, manifest):
+    with atomic_path(os.path.join(store_dir, MANIFEST_NAME)) as tmp, open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def _remove_parts(store_dir, parts):
+    for part in parts:
+        try:
+            os.remove(os.path.join(store_dir, part))
+        except FileNotFoundError:
+            pass
+
+
+def source_listing(source_dir, pattern="*.csv"):
+    """Name, size and mtime of every export in ``source_dir``: one directory read, no hashing.
+
+    Equal listings mean ``ingest_directory`` has nothing to do, so callers
+    can key a cache on it instead of re-running the ingest.
+    """
+    with os.scandir(source_dir) as entries:
+        listing = [
+            (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+            for entry in entries if fnmatch.fnmatch(entry.name, pattern) and entry.is_file()
+        ]
+    return tuple(sorted(listing))
+
+
+def partition_dir(store_dir, account, month):
+    return os.path.join(store_dir, f"AccountID={account}", f"{MONTH_COLUMN}={month}")
+
+
+def _compact(part):
+    part = part.reset_index(drop=True)
+    for col in part.columns:
+        if isinstance(part[col].dtype, pd.CategoricalDtype):
+            part[col] = part[col].cat.remove_unused_categories()
+    return part
+
+
+def ingest_file(path, store_dir, fp):
+    """Split one export into account/month partitions; returns their relative paths."""
+    df = load_billing_csv(path, workers=1)
+    if MONTH_COLUMN not in df.columns:
+        month = billing_month_from_name(path)
+        if month is None:
+            raise ValueError(f"Cannot determine the billing month of {path}: "
+                             f"add a {MONTH_COLUMN} column or a YYYY-MM in the file name.")
+        df[MONTH_COLUMN] = month
+    df[MONTH_COLUMN] = df[MONTH_COLUMN].astype("category")
+
+    # Per source path, so equal exports from two directories never share a file
+    stem = source_key(path)
+    parts = []
+    for (account, month), part in df.groupby(["AccountID", MONTH_COLUMN], observed=True, sort=True):
+        target_dir = partition_dir(store_dir, account, month)
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, f"{stem}-{fp.sha256[:12]}.arrow")
+        write_table(_compact(part), target)
+        parts.append(os.path.relpath(target, store_dir))
+    return parts
+
+
+def _ingest_task(store_dir, item):
+    path, fp = item
+    return ingest_file(path, store_dir, fp)
+
+
+def ingest_directory(source_dir, store_dir, pattern="*.csv", workers=None):
+    """Bring ``store_dir`` up to date with the exports in ``source_dir``.
+
+    The store mirrors exactly one directory. Unchanged files (same size and
+    mtime, or same content hash) are skipped; changed files have their old
+    partitions replaced. Files that are no longer in ``source_dir`` (deleted,
+    or ingested from another directory) have theirs removed. New files are
+    parsed in a process pool with ``workers > 1``. The manifest is only
+    rewritten when something changed. Returns the list of source files that
+    were (re)ingested.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = _read_manifest(store_dir)
+    sources = sorted(glob.glob(os.path.join(source_dir, pattern)))
+    current = {os.path.abspath(path) for path in sources}
+    changed = False
+    for key in [key for key in manifest if key not in current]:
+        _remove_parts(store_dir, manifest.pop(key)["parts"])
+        changed = True
+
+    pending = []
+    for path in sources:
+        entry = manifest.get(os.path.abspath(path))
+        previous = Fingerprint(**entry["fingerprint"]) if entry else None
+        fp = refresh_fingerprint(path, previous)
+        if entry and fp.sha256 == previous.sha256:
+            if fp != previous:
+                # Touched but identical: remember the new mtime, skip the parse
+                entry["fingerprint"] = fp._asdict()
+                changed = True
+            continue
+        pending.append((path, fp))
+
+    results = map_tasks(partial(_ingest_task, store_dir), pending, workers)
+    ingested = []
+    for (path, fp), parts in zip(pending, results):
+        key = os.path.abspath(path)
+        entry = manifest.get(key)
+        _remove_parts(store_dir, set(entry["parts"] if entry else []) - set(parts))
+        manifest[key] = {"fingerprint": fp._asdict(), "parts": parts}
+        ingested.append(path)
+    if changed or ingested:
+        _write_manifest(store_dir, manifest)
+    return ingested
+
+
+def store_for(source_dir, cache_dir):
+    """Partition store of ``source_dir``: one per source directory under ``cache_dir``."""
+    return os.path.join(cache_dir, "partitions", source_key(source_dir.rstrip(os.sep)))
+
+
+def list_partitions(store_dir):
+    """One row per partition file: AccountID, BillingMonth and relative path."""
+    rows = []
+    for entry in _read_manifest(store_dir).values():
+        for part in entry["parts"]:
+            account_dir, month_dir = part.split(os.sep)[:2]
+            rows.append({
+                "AccountID": account_dir.split("=", 1)[1],
+                MONTH_COLUMN: month_dir.split("=", 1)[1],
+                "path": part,
+            })
+    return pd.DataFrame(rows, columns=["AccountID", MONTH_COLUMN, "path"])
+
+
+def prune(partitions, accounts=None, months=None):
+    """Partitions matching the account and month selections (None = all)."""
+    keep = pd.Series(True, index=partitions.index)
+    if accounts is not None:
+        keep &= partitions["AccountID"].isin([str(a) for a in accounts])
+    if months is not None:
+        keep &= partitions[MONTH_COLUMN].isin(months)
+    return partitions[keep]
+
+
+def partition_version(partitions):
+    """Stable version key for a set of partitions (file names embed source hashes)."""
+    digest = hashlib.sha256("\n".join(sorted(partitions["path"])).encode())
+    return digest.hexdigest()
+
+
+def load_partitions(store_dir, partitions, columns=None):
+    """Read only the given partition files and concatenate them."""
+    frames = [read_table(os.path.join(store_dir, part), columns) for part in sorted(partitions["path"])]
+    return concat_chunks(frames)
@@ -0,0 +1,255 @@
+"""Tagging policies loaded from YAML and evaluated as vectorized column checks.
+
+A policy file lists the required tags and a set of rules::
+
+    required_tags: &required [Department, Project, Owner]
+    rules:
+      - id: prod-ownership
+        description: Prod requires Owner and CostCenter
+        when: {Environment: Prod}          # scope: column -> value(s)
+        require: [Owner, CostCenter]       # tags that must be filled in
+      - id: cost-center-format
+        match: {CostCenter: 'CC\\d{3}'}    # filled-in values must fully match
+      - id: known-environments
+        allowed: {Environment: [Prod, Dev, Test]}
+
+Rules compile to per-column predicates. Regexes and value lists are
+evaluated once per distinct value (category) and broadcast back through
+integer codes, so the cost per row is a gather, whatever the rule. Each
+predicate is computed once per row slice and shared between rules.
+"""
+
+import hashlib
+import os
+import re
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from .compliance import REQUIRED_TAGS, present
+from .ingest import COST_COLUMN
+from .parallel import map_tasks, row_slices
+
+POLICY_ENV = "CLOUDMART_POLICY"
+DEFAULT_POLICY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   "policies", "tagging.yaml")
+RULE_KEYS = {"id", "description", "when", "require", "match", "allowed"}
+
+Rule = namedtuple("Rule", ["id", "description", "when", "require", "match", "allowed"])
+
+
+class Policy:
+    """Parsed policy: required tags plus compiled rules, versioned by content."""
+
+    def __init__(self, rules, required_tags=REQUIRED_TAGS, version=""):
+        self.rules = list(rules)
+        self.required_tags = list(required_tags)
+        self.version = version
+
+    @property
+    def rule_ids(self):
+        return [rule.id for rule in self.rules]
+
+
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _mapping(spec, key, rule_id):
+    value = spec.get(key) or {}
+    if not isinstance(value, dict):
+        raise ValueError(f"Policy rule {rule_id!r}: {key!r} must map column names to values, "
+                         f"got {type(value).__name__}.")
+    return value
+
+
+def _compile_rule(spec, i):
+    if not isinstance(spec, dict):
+        raise ValueError(f"Policy rule #{i + 1} must be a mapping, got {type(spec).__name__}.")
+    unknown = set(spec) - RULE_KEYS
+    if unknown:
+        raise ValueError(f"Policy rule #{i + 1} has unknown keys: {', '.join(sorted(unknown))}.")
+    rule_id = str(spec.get("id") or f"rule-{i + 1}")
+    checks = [spec.get(key) for key in ("require", "match", "allowed")]
+    if not any(checks):
+        raise ValueError(f"Policy rule {rule_id!r} needs at least one of require, match or allowed.")
+    when, match, allowed = (_mapping(spec, key, rule_id) for key in ("when", "match", "allowed"))
+    try:
+        match = {col: re.compile(str(pattern)) for col, pattern in match.items()}
+    except re.error as e:
+        raise ValueError(f"Policy rule {rule_id!r} has an invalid regex: {e}") from None
+    return Rule(
+        id=rule_id,
+        description=str(spec.get("description", "")),
+        when={col: [str(v) for v in _as_list(values)] for col, values in when.items()},
+        require=[str(col) for col in _as_list(spec.get("require") or [])],
+        match=match,
+        allowed={col: [str(v) for v in _as_list(values)] for col, values in allowed.items()},
+    )
+
+
+def parse_policy(text):
+    """``Policy`` from YAML text; raises ValueError on malformed policies."""
+    try:
+        spec = yaml.safe_load(text) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(f"Policy is not valid YAML: {e}") from None
+    if not isinstance(spec, dict):
+        raise ValueError("Policy must be a mapping with a 'rules' list.")
+    rules = spec.get("rules") or []
+    if not isinstance(rules, list):
+        raise ValueError("Policy 'rules' must be a list of rules.")
+    rules = [_compile_rule(rule, i) for i, rule in enumerate(rules)]
+    ids = [rule.id for rule in rules]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Policy rule ids must be unique.")
+    required = spec.get("required_tags", REQUIRED_TAGS)
+    if not isinstance(required, list):
+        raise ValueError("Policy 'required_tags' must be a list of tag names.")
+    required = [str(tag) for tag in required]
+    return Policy(rules, required, hashlib.sha256(text.encode()).hexdigest())
+
+
+def read_policy_text(path=None):
+    """YAML text of the policy at ``path``, ``CLOUDMART_POLICY`` or ``policies/tagging.yaml``.
+
+    For callers that cache compiled policies by content (see ``parse_policy``).
+    """
+    path = path or os.environ.get(POLICY_ENV) or DEFAULT_POLICY_PATH
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def load_policy(path=None):
+    """Policy from ``path``, ``CLOUDMART_POLICY`` or ``policies/tagging.yaml``."""
+    return parse_policy(read_policy_text(path))
+
+
+# ----------------------------------------------------------
+# VECTORIZED EVALUATION
+# ----------------------------------------------------------
+def value_mask(values, test):
+    """``test`` applied to each distinct value of ``values``, broadcast to rows.
+
+    Missing values get False. Categoricals reuse their codes; other dtypes
+    are factorized first.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    hits = np.fromiter((test(str(u)) for u in uniques), dtype=bool, count=len(uniques))
+    return np.append(hits, False)[codes]
+
+
+class _Predicates:
+    """Column predicates for one row slice, each computed at most once."""
+
+    def __init__(self, df):
+        self.df = df
+        self._cache = {}
+
+    def _get(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def present(self, col):
+        if col not in self.df.columns:
+            return np.zeros(len(self.df), dtype=bool)
+        return self._get(("present", col), lambda: present(self.df[col]))
+
+    def isin(self, col, values):
+        if col not in self.df.columns:
+            return np.zeros(len(self.df), dtype=bool)
+        allowed = frozenset(values)
+        return self._get(("isin", col, allowed), lambda: value_mask(self.df[col], allowed.__contains__))
+
+    def fullmatch(self, col, regex):
+        if col not in self.df.columns:
+            return np.zeros(len(self.df), dtype=bool)
+        return self._get(("match", col, regex.pattern),
+                         lambda: value_mask(self.df[col], lambda v: regex.fullmatch(v) is not None))
+
+
+def _violations(rule, preds, n):
+    scope = np.ones(n, dtype=bool)
+    for col, values in rule.when.items():
+        scope &= preds.isin(col, values)
+    bad = np.zeros(n, dtype=bool)
+    for col in rule.require:
+        bad |= ~preds.present(col)
+    for col, regex in rule.match.items():
+        bad |= preds.present(col) & ~preds.fullmatch(col, regex)
+    for col, values in rule.allowed.items():
+        bad |= preds.present(col) & ~preds.isin(col, values)
+    return scope, scope & bad
+
+
+def _evaluate_slice(df, rules):
+    preds = _Predicates(df)
+    scope = np.zeros((len(df), len(rules)), dtype=bool)
+    bad = np.zeros((len(df), len(rules)), dtype=bool)
+    for i, rule in enumerate(rules):
+        scope[:, i], bad[:, i] = _violations(rule, preds, len(df))
+    return scope.sum(axis=0), bad
+
+
+class PolicyReport:
+    """Per-rule violations of one dataset, with the cost each one puts at risk."""
+
+    def __init__(self, policy, violations, in_scope, cost):
+        self.policy = policy
+        self.violations = violations  # rule id -> sorted row positions
+        self.in_scope = in_scope      # rule id -> resources the rule applies to
+        self._cost = cost
+
+    def violators(self, rule_id=None):
+        """Row positions violating ``rule_id`` (or any rule)."""
+        if rule_id is not None:
+            return self.violations[rule_id]
+        if not self.violations:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(list(self.violations.values())))
+
+    def summary(self, rows=None):
+        """One row per rule: scope, violations and cost at risk.
+
+        ``rows`` (sorted positions, e.g. the filtered rows) restricts the
+        counts to those resources.
+        """
+        records = []
+        for rule in self.policy.rules:
+            hit = self.violations[rule.id]
+            record = {"Rule": rule.id, "Description": rule.description}
+            if rows is None:
+                record["In Scope"] = self.in_scope[rule.id]
+            else:
+                hit = hit[np.isin(hit, rows, assume_unique=True)]
+            record["Violations"] = len(hit)
+            record["Cost at Risk (USD)"] = float(self._cost[hit].sum())
+            records.append(record)
+        return pd.DataFrame(records)
+
+    def cost_at_risk(self, rows=None):
+        """Cost of resources violating at least one rule (each counted once)."""
+        hit = self.violators()
+        if rows is not None:
+            hit = hit[np.isin(hit, rows, assume_unique=True)]
+        return float(self._cost[hit].sum())
+
+
+def evaluate_policy(df, policy, workers=None):
+    """Evaluate every rule of ``policy`` over ``df`` in one pass per row slice."""
+    slices = row_slices(df)
+    parts = map_tasks(partial(_evaluate_slice, rules=policy.rules), slices, workers)
+    bad = np.vstack([part[1] for part in parts]) if parts else np.zeros((0, len(policy.rules)), dtype=bool)
+    scope = sum(part[0] for part in parts)
+    violations = {rule.id: np.flatnonzero(bad[:, i]) for i, rule in enumerate(policy.rules)}
+    in_scope = {rule.id: int(scope[i]) for i, rule in enumerate(policy.rules)}
+    cost = df[COST_COLUMN].to_numpy(dtype="float64", na_value=0.0) if COST_COLUMN in df.columns \
+        else np.zeros(len(df))
+    return PolicyReport(policy, violations, in_scope, np.nan_to_num(cost))
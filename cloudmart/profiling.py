@@ -0,0 +1,132 @@
+"""Per-rerun section timing, memory deltas and optional cProfile capture."""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import resource
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+logger = logging.getLogger("cloudmart.profiling")
+
+DEBUG_ENV = "CLOUDMART_DEBUG"
+
+_handler = None
+
+
+def debug_enabled():
+    """Whether ``CLOUDMART_DEBUG`` asks for the debug panel by default."""
+    return os.environ.get(DEBUG_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def enable_logging(stream=None):
+    """Write the per-section JSON records to ``stream`` (stderr by default).
+
+    Records are logged at INFO on ``cloudmart.profiling``, below Python's
+    default WARNING threshold, so nothing is emitted until this (or the
+    host's own logging config) enables the logger. Safe to call on every
+    rerun: the handler is attached once.
+    """
+    global _handler
+    if _handler is None:
+        _handler = logging.StreamHandler(stream)
+        _handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(_handler)
+        logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Profiler:
+    """Times named sections of one script run.
+
+    ``mark(name)`` closes the open section and starts the next one, which
+    suits a long top-to-bottom script; ``section(name)`` is the context
+    manager form for nested or isolated blocks. Each record holds wall
+    time, an optional row count and the RSS change over the section.
+    """
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id or f"{time.time():.6f}"
+        self.records = []
+        self._open = None
+        self._start = time.perf_counter()
+
+    def _begin(self, name, rows):
+        return {"section": name, "rows": rows, "t0": time.perf_counter(), "rss0": rss_mb()}
+
+    def _end(self, record):
+        self.records.append({
+            "section": record["section"],
+            "rows": record["rows"],
+            "ms": round((time.perf_counter() - record["t0"]) * 1000, 3),
+            "mem_delta_mb": round(rss_mb() - record["rss0"], 3),
+        })
+
+    def mark(self, name, rows=None):
+        """End the current section (if any) and start ``name``."""
+        if self._open is not None:
+            self._end(self._open)
+        self._open = self._begin(name, rows)
+
+    def set_rows(self, rows):
+        """Attach a row count to the open section."""
+        if self._open is not None:
+            self._open["rows"] = rows
+
+    @contextmanager
+    def section(self, name, rows=None):
+        record = self._begin(name, rows)
+        try:
+            yield record
+        finally:
+            self._end(record)
+
+    def finish(self):
+        """Close the open section and log every record as one JSON line."""
+        if self._open is not None:
+            self._end(self._open)
+            self._open = None
+        total_ms = round((time.perf_counter() - self._start) * 1000, 3)
+        for record in self.records:
+            logger.info(json.dumps(dict(record, run=self.run_id)))
+        logger.info(json.dumps({"run": self.run_id, "section": "total", "ms": total_ms}))
+        return total_ms
+
+    def frame(self):
+        frame = pd.DataFrame(self.records, columns=["section", "rows", "ms", "mem_delta_mb"])
+        return frame.astype({"rows": "Int64"})
+
+
+class RunProfile:
+    """cProfile of a whole run, rendered as a pstats text report."""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self._profile = cProfile.Profile() if enabled else None
+
+    def start(self):
+        if self.enabled:
+            self._profile.enable()
+
+    def stop(self, limit=40):
+        if not self.enabled:
+            return None
+        self._profile.disable()
+        out = io.StringIO()
+        pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
@@ -0,0 +1,184 @@
+"""ResourceID-indexed remediation engine (Task Set 5).
+
+Edits are kept as a diff of changed cells (``row``, ``column``, ``value``)
+on top of the base dataset; the full remediated frame is only built when it
+is exported.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .compliance import REQUIRED_TAGS, presence_matrix
+from .ingest import TAGGED_COLUMN
+
+DIFF_COLUMNS = ["row", "column", "value"]
+
+
+def empty_diff():
+    return pd.DataFrame({"row": np.empty(0, dtype=np.int64), "column": [], "value": []})
+
+
+def merge_diffs(older, newer):
+    """Combine two diffs; cells edited in both keep the newer value."""
+    merged = pd.concat([older, newer], ignore_index=True)
+    return merged.drop_duplicates(["row", "column"], keep="last").reset_index(drop=True)
+
+
+def _same(old, new):
+    return ((old == new) | (pd.isna(old) & pd.isna(new))).astype(bool)
+
+
+def unedited(diff, edits):
+    """Cells of ``diff`` that ``edits`` does not touch (same ``row`` and ``column``)."""
+    cells = pd.MultiIndex.from_frame(diff[["row", "column"]])
+    return diff[~cells.isin(pd.MultiIndex.from_frame(edits[["row", "column"]]))].reset_index(drop=True)
+
+
+class RemediationEngine:
+    """Looks resources up by ResourceID and applies tag edits as cell diffs."""
+
+    def __init__(self, df, required_tags=REQUIRED_TAGS):
+        self.base = df
+        self.required_tags = [tag for tag in required_tags if tag in df.columns]
+        ids = df["ResourceID"].astype(str).to_numpy(dtype=object)
+        self._order = np.argsort(ids, kind="stable")
+        self._sorted_ids = ids[self._order]
+        self.untagged_mask = ~presence_matrix(df, self.required_tags).all(axis=1)
+
+    def untagged(self):
+        """Rows missing at least one required tag (5.1)."""
+        return self.base[self.untagged_mask]
+
+    def lookup(self, resource_ids):
+        """Match ``resource_ids`` to base rows.
+
+        Returns ``(which, rows)``: ``rows[i]`` is a base row position holding
+        ``resource_ids[which[i]]``. Duplicate ResourceIDs match every copy.
+        """
+        targets = np.asarray(resource_ids, dtype=object).astype(str)
+        lo = np.searchsorted(self._sorted_ids, targets, side="left")
+        hi = np.searchsorted(self._sorted_ids, targets, side="right")
+        counts = hi - lo
+        which = np.repeat(np.arange(len(targets)), counts)
+        # Expand each [lo, hi) range into consecutive positions of the sort order.
+        starts = np.repeat(lo - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+        return which, self._order[starts + np.arange(counts.sum())]
+
+    def diff(self, edited, applied=None):
+        """Cells of ``edited`` (rows keyed by ResourceID) that differ from the base.
+
+        With ``applied`` (a diff), cells are compared to the base with those
+        edits applied instead. A cell set back to its base value then shows
+        up as well, so merging the result undoes the earlier edit.
+        """
+        edited = edited.dropna(subset=["ResourceID"]).drop_duplicates("ResourceID")
+        which, rows = self.lookup(edited["ResourceID"].to_numpy())
+        parts = []
+        for tag in self.required_tags:
+            new = edited[tag].to_numpy(dtype=object)[which]
+            new[new == ""] = None  # a cleared text cell is a missing tag
+            old = self.base[tag].to_numpy(dtype=object)[rows]
+            if applied is not None:
+                cells = applied[applied["column"] == tag]
+                where = pd.Index(cells["row"].to_numpy(dtype=np.int64)).get_indexer(rows)
+                old[where >= 0] = cells["value"].to_numpy(dtype=object)[where[where >= 0]]
+            changed = ~_same(old, new)
+            parts.append(pd.DataFrame({"row": rows[changed], "column": tag, "value": new[changed]}))
+        if not parts:
+            return empty_diff()
+        return merge_diffs(empty_diff(), pd.concat(parts, ignore_index=True))
+
+    def compact(self, diff):
+        """``diff`` without the cells that hold their base value (undone edits)."""
+        if diff.empty:
+            return diff
+        columns = diff["column"].to_numpy(dtype=object)
+        rows = diff["row"].to_numpy(dtype=np.int64)
+        values = diff["value"].to_numpy(dtype=object)
+        keep = np.ones(len(diff), dtype=bool)
+        for tag in pd.unique(columns):
+            at = np.flatnonzero(columns == tag)
+            keep[at] = ~_same(self.base[tag].to_numpy(dtype=object)[rows[at]], values[at])
+        return diff[keep].reset_index(drop=True)
+
+    def _touched(self, diff):
+        # Base values of the required tags for the edited rows, with the diff
+        # applied; only these rows need Tagged re-evaluated.
+        touched = np.unique(diff["row"].to_numpy(dtype=np.int64))
+        tags = self.base[self.required_tags].iloc[touched].astype(object).reset_index(drop=True)
+        for tag, cells in diff.groupby("column", sort=False):
+            pos = np.searchsorted(touched, cells["row"].to_numpy(dtype=np.int64))
+            tags.iloc[pos, tags.columns.get_loc(tag)] = cells["value"].to_numpy()
+        tagged = pd.array(presence_matrix(tags, self.required_tags).all(axis=1), dtype="boolean")
+        return touched, tagged
+
+    def tag_counts(self, diff):
+        """Tagged value counts after applying ``diff``, without materializing."""
+        counts = self.base[TAGGED_COLUMN].value_counts()
+        if diff.empty:
+            return counts
+        touched, tagged = self._touched(diff)
+        before = self.base[TAGGED_COLUMN].iloc[touched].value_counts()
+        after = pd.Series(tagged).value_counts()
+        counts = counts.sub(before, fill_value=0).add(after, fill_value=0)
+        return counts[counts > 0].astype(int)
+
+    def materialize(self, diff):
+        """Full remediated frame (base + diff); built only for export."""
+        chunks = list(self.iter_materialized(diff, max(1, len(self.base))))
+        return chunks[0] if chunks else self.base.copy()
+
+    def view(self, rows, diff):
+        """Base rows at positions ``rows`` with ``diff`` applied (e.g. one editor page)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        out = self.base.iloc[rows].copy()
+        cells = diff[diff["row"].isin(rows)]
+        if cells.empty:
+            return out
+        where = pd.Index(rows).get_indexer(cells["row"].to_numpy(dtype=np.int64))
+        for tag, part in cells.assign(pos=where).groupby("column", sort=False):
+            values = part["value"].to_numpy(dtype=object)
+            if isinstance(out[tag].dtype, pd.CategoricalDtype):
+                new = pd.Index(values).dropna().difference(out[tag].cat.categories)
+                if len(new):
+                    out[tag] = out[tag].cat.add_categories(new)
+            out.iloc[part["pos"].to_numpy(), out.columns.get_loc(tag)] = values
+        if TAGGED_COLUMN in out.columns:
+            touched, tagged = self._touched(cells)
+            out.iloc[pd.Index(rows).get_indexer(touched), out.columns.get_loc(TAGGED_COLUMN)] = tagged
+        return out
+
+    def iter_materialized(self, diff, chunk_rows=100_000):
+        """``materialize(diff)`` as consecutive row slices of ``chunk_rows``.
+
+        Only one slice is copied at a time, so a streamed export never holds
+        a second full copy of the dataset. Every slice has the same dtypes
+        (categories added by the diff are added to all of them).
+        """
+        added = {}
+        for tag, cells in diff.groupby("column", sort=False):
+            col = self.base[tag]
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                new = pd.Index(cells["value"].to_numpy(dtype=object)).dropna().difference(col.cat.categories)
+                if len(new):
+                    added[tag] = new
+        if diff.empty:
+            touched, tagged = np.empty(0, dtype=np.int64), pd.array([], dtype="boolean")
+        else:
+            touched, tagged = self._touched(diff)
+        cell_rows = diff["row"].to_numpy(dtype=np.int64)
+        tagged_loc = self.base.columns.get_loc(TAGGED_COLUMN) if TAGGED_COLUMN in self.base.columns else None
+
+        for start in range(0, len(self.base), chunk_rows):
+            stop = min(start + chunk_rows, len(self.base))
+            out = self.base.iloc[start:stop].copy()
+            for tag, new in added.items():
+                out[tag] = out[tag].cat.add_categories(new)
+            cells = diff[(cell_rows >= start) & (cell_rows < stop)]
+            for tag, part in cells.groupby("column", sort=False):
+                rows = part["row"].to_numpy(dtype=np.int64) - start
+                out.iloc[rows, out.columns.get_loc(tag)] = part["value"].to_numpy(dtype=object)
+            lo, hi = np.searchsorted(touched, [start, stop])
+            if hi > lo and tagged_loc is not None:
+                out.iloc[touched[lo:hi] - start, tagged_loc] = tagged[lo:hi]
+            yield out
@@ -0,0 +1,106 @@
+"""Task Set 1-5 computations shared by the dashboard and the batch CLI.
+
+Nothing here imports Streamlit or a plotting library.
+"""
+
+import pandas as pd
+
+from .compliance import SCORE_COLUMN, TAG_FIELDS, score_completeness
+from .cube import build_cost_cube, rollup
+from .ingest import COST_COLUMN, TAG_LABELS, TAGGED_COLUMN
+
+
+def missing_values_summary(df):
+    """1.2 – null count per column."""
+    summary = df.isnull().sum().reset_index()
+    summary.columns = ["Column Name", "Missing Values"]
+    return summary
+
+
+def tag_status_counts(df):
+    """1.4 / 1.5 – total, tagged and untagged resources and the untagged share."""
+    total = len(df)
+    tagged = int(df[TAGGED_COLUMN].eq(True).sum())
+    untagged = int(df[TAGGED_COLUMN].eq(False).sum())
+    return {
+        "total": total,
+        "tagged": tagged,
+        "untagged": untagged,
+        "untagged_pct": (untagged / total * 100) if total else 0,
+    }
+
+
+def cost_by_tag_status(cube, filters=None):
+    """2.1 – total cost of tagged vs untagged resources (Tagged as Yes/No)."""
+    cost = rollup(cube, TAGGED_COLUMN, filters)[[TAGGED_COLUMN, COST_COLUMN]]
+    cost[TAGGED_COLUMN] = cost[TAGGED_COLUMN].map(TAG_LABELS)
+    return cost
+
+
+def untagged_cost_pct(cost_by_tag):
+    """2.2 – share of total cost that is untagged, from ``cost_by_tag_status``."""
+    tagged = cost_by_tag.loc[cost_by_tag[TAGGED_COLUMN] == "Yes", COST_COLUMN].sum()
+    untagged = cost_by_tag.loc[cost_by_tag[TAGGED_COLUMN] == "No", COST_COLUMN].sum()
+    total = tagged + untagged
+    return (untagged / total * 100) if total else 0
+
+
+def untagged_cost_by_department(cube, filters=None):
+    """2.3 – untagged cost per department, highest first."""
+    return (
+        rollup(cube, "Department", {**(filters or {}), TAGGED_COLUMN: [False]})
+        .set_index("Department")[COST_COLUMN]
+        .sort_values(ascending=False)
+    )
+
+
+def cost_by_project(cube, filters=None):
+    """2.4 – total cost per project, highest first."""
+    return (
+        rollup(cube, "Project", filters)
+        .set_index("Project")[COST_COLUMN]
+        .sort_values(ascending=False)
+    )
+
+
+def cost_by_environment_and_tag(cube, filters=None):
+    """2.5 – cost per environment split by tag status."""
+    cost = rollup(cube, ["Environment", TAGGED_COLUMN], filters)[["Environment", TAGGED_COLUMN, COST_COLUMN]]
+    cost[TAGGED_COLUMN] = cost[TAGGED_COLUMN].map(TAG_LABELS)
+    return cost
+
+
+def scores_table(df, scores):
+    """3.1 / 3.2 – ``scores`` joined onto ResourceID for display or export."""
+    shown = df.loc[scores.index, ["ResourceID"]] if "ResourceID" in df.columns else pd.DataFrame(index=scores.index)
+    return shown.assign(**{SCORE_COLUMN: scores})
+
+
+def untagged_resources(df):
+    """3.4 – resources marked untagged, with their cost."""
+    return df[df[TAGGED_COLUMN].eq(False).fillna(False)][["ResourceID", COST_COLUMN]]
+
+
+def build_reports(df, cube=None, completeness=None, lowest_n=5, workers=None):
+    """Every Task Set report for ``df`` as ``(tables, summary)``.
+
+    ``tables`` maps report name -> DataFrame; ``summary`` holds the scalar
+    metrics. ``cube``/``completeness`` are reused when already built.
+    """
+    cube = build_cost_cube(df, workers=workers) if cube is None else cube
+    completeness = score_completeness(df, TAG_FIELDS, workers=workers) if completeness is None else completeness
+    cost_by_tag = cost_by_tag_status(cube)
+
+    tables = {
+        "missing_values": missing_values_summary(df),
+        "cost_by_tag_status": cost_by_tag,
+        "untagged_cost_by_department": untagged_cost_by_department(cube).reset_index(),
+        "cost_by_project": cost_by_project(cube).reset_index(),
+        "cost_by_environment_and_tag": cost_by_environment_and_tag(cube),
+        "completeness_scores": scores_table(df, completeness.scores),
+        "lowest_completeness": scores_table(df, completeness.lowest(lowest_n)),
+        "missing_tag_fields": completeness.missing_counts.sort_values("Missing Count", ascending=False),
+        "untagged_resources": untagged_resources(df),
+    }
+    summary = dict(tag_status_counts(df), untagged_cost_pct=float(untagged_cost_pct(cost_by_tag)))
+    return tables, summary
@@ -0,0 +1,70 @@
+"""Process-wide, read-only dataset shared by every dashboard session."""
+
+import threading
+
+from .compliance import REQUIRED_TAGS, TAG_FIELDS, score_completeness
+from .cube import build_cost_cube
+from .filters import FilterIndex
+from .policy import evaluate_policy
+from .remediation import RemediationEngine
+
+
+class SharedDataset:
+    """One loaded dataset version plus the structures derived from it.
+
+    Hold a single instance per version (e.g. in ``st.cache_resource``) so
+    concurrent sessions read the same frame, cost cube and indexes instead
+    of each keeping private copies. Nothing here may be modified in place;
+    per-session state is limited to filter selections and remediation diffs.
+
+    Derived structures are built on first use, exactly once, even when
+    several sessions ask for them at the same time.
+    """
+
+    def __init__(self, df, version, workers=None):
+        self.df = df
+        self.version = version
+        self.workers = workers
+        self._derived = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def derive(self, name, build):
+        """Return ``build()`` computed once for this version under ``name``."""
+        if name in self._derived:
+            return self._derived[name]
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._derived:
+                self._derived[name] = build()
+        return self._derived[name]
+
+    def warm(self):
+        """Build the structures every rerun needs (cube, filter index) now."""
+        self.cube
+        self.filter_index
+        return self
+
+    @property
+    def cube(self):
+        return self.derive("cube", lambda: build_cost_cube(self.df, workers=self.workers))
+
+    @property
+    def filter_index(self):
+        return self.derive("filter_index", lambda: FilterIndex(self.df))
+
+    def completeness(self, fields=TAG_FIELDS):
+        fields = list(fields)
+        return self.derive(("completeness", tuple(fields)),
+                           lambda: score_completeness(self.df, fields, workers=self.workers))
+
+    def remediation(self, required_tags=REQUIRED_TAGS):
+        required_tags = list(required_tags)
+        return self.derive(("remediation", tuple(required_tags)),
+                           lambda: RemediationEngine(self.df, required_tags))
+
+    def policy_report(self, policy):
+        """``PolicyReport`` for ``policy``, cached per policy version."""
+        return self.derive(("policy", policy.version),
+                           lambda: evaluate_policy(self.df, policy, workers=self.workers))
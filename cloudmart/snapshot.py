@@ -0,0 +1,125 @@
+"""Columnar on-disk snapshots of billing CSVs, invalidated by source fingerprint."""
+
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+
+import pandas as pd
+import pyarrow as pa
+
+from .files import atomic_path
+from .ingest import load_billing_csv
+
+DEFAULT_CACHE_DIR = ".cloudmart_cache"
+
+Fingerprint = namedtuple("Fingerprint", ["size", "mtime_ns", "sha256"])
+
+
+def _hash_file(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_key(path):
+    """``<name>-<hash of the absolute path>``: unique per source file, readable in listings."""
+    path = os.path.abspath(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    return f"{name}-{hashlib.sha256(path.encode()).hexdigest()[:8]}"
+
+
+def _manifest_path(path, cache_dir):
+    return os.path.join(cache_dir, f"{source_key(path)}.json")
+
+
+def fingerprint(path, cache_dir=DEFAULT_CACHE_DIR):
+    """Return the size, mtime and content hash of ``path``.
+
+    The content hash is reused from the last manifest when size and mtime
+    are unchanged, so reruns only ``stat`` the source file.
+    """
+    return refresh_fingerprint(path, _read_manifest(path, cache_dir))
+
+
+def refresh_fingerprint(path, previous=None):
+    """Fingerprint ``path``, reusing ``previous`` if size and mtime still match."""
+    st = os.stat(path)
+    if previous is not None and (previous.size, previous.mtime_ns) == (st.st_size, st.st_mtime_ns):
+        return previous
+    return Fingerprint(st.st_size, st.st_mtime_ns, _hash_file(path))
+
+
+def _read_manifest(path, cache_dir):
+    try:
+        with open(_manifest_path(path, cache_dir)) as f:
+            return Fingerprint(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def snapshot_path(path, fp, cache_dir=DEFAULT_CACHE_DIR):
+    return os.path.join(cache_dir, f"{source_key(path)}-{fp.sha256[:16]}.arrow")
+
+
+# ----------------------------------------------------------
+# ARROW IPC I/O
+# ----------------------------------------------------------
+def write_table(df, path):
+    """Write ``df`` as an uncompressed Arrow IPC file (memory-mappable)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with atomic_path(path) as tmp, pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def read_table(path, columns=None):
+    """Memory-map an Arrow IPC file back into a typed DataFrame."""
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select([col for col in columns if col in table.column_names])
+    return table.to_pandas(types_mapper={pa.bool_(): pd.BooleanDtype()}.get)
+
+
+# ----------------------------------------------------------
+# SNAPSHOTS
+# ----------------------------------------------------------
+def build_snapshot(path, cache_dir=DEFAULT_CACHE_DIR, fp=None, workers=None):
+    """Parse ``path`` and (re)write its snapshot; returns the fingerprint."""
+    fp = fp or fingerprint(path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    target = snapshot_path(path, fp, cache_dir)
+    if not os.path.exists(target):
+        write_table(load_billing_csv(path, workers=workers), target)
+    _remove_stale(path, target, cache_dir)
+    with atomic_path(_manifest_path(path, cache_dir)) as tmp, open(tmp, "w") as f:
+        json.dump(fp._asdict(), f)
+    return fp
+
+
+def _remove_stale(path, keep, cache_dir):
+    # Exactly this source's snapshots: other sources never match the pattern
+    legacy = os.path.basename(os.path.abspath(path))
+    snapshot = r"-[0-9a-f]{16}\.arrow"
+    stale = re.compile("|".join([
+        re.escape(source_key(path)) + snapshot,
+        # basename-only layout used before source_key
+        re.escape(os.path.splitext(legacy)[0]) + snapshot,
+        re.escape(legacy) + r"\.json",
+    ]))
+    for name in os.listdir(cache_dir):
+        full = os.path.join(cache_dir, name)
+        if stale.fullmatch(name) and full != keep:
+            os.remove(full)
+
+
+def load_snapshot(path, cache_dir=DEFAULT_CACHE_DIR, workers=None):
+    """Return ``(fingerprint, DataFrame)`` for ``path``, building the snapshot if needed."""
+    fp = fingerprint(path, cache_dir)
+    target = snapshot_path(path, fp, cache_dir)
+    if not os.path.exists(target) or _read_manifest(path, cache_dir) != fp:
+        build_snapshot(path, cache_dir, fp, workers)
+    return fp, read_table(target)
@@ -0,0 +1,229 @@
+"""Monthly cost trends and next-month forecasts per Department/Project/Service.
+
+Every (dimension value, tag status) pair is one monthly cost series. All
+series share the same design matrix (intercept + month index), so they are
+fitted together as one OLS problem with a 2-D endog, split into column
+blocks that can run in a process pool.
+
+A fitted ``TrendModel`` keeps the sufficient statistics ``X'X``, ``X'y``
+and ``y'y`` of every series. A new month adds its rows to them, which
+gives exactly the OLS fit over all months without revisiting old data.
+"""
+
+import hashlib
+import os
+import pickle
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from scipy import stats
+
+from .files import atomic_path
+from .ingest import COST_COLUMN, TAG_LABELS, TAGGED_COLUMN
+from .parallel import map_tasks
+from .partitions import MONTH_COLUMN, load_partitions
+from .snapshot import DEFAULT_CACHE_DIR
+
+TREND_DIMENSIONS = ["Department", "Project", "Service"]
+TAG_STATUS = "TagStatus"
+UNKNOWN_LABEL = "Unknown"
+MISSING_LABEL = "(missing)"
+SERIES_BLOCK = 2_000
+
+
+def month_index(months):
+    """Months (``YYYY-MM``) as consecutive integers, so gaps stay gaps."""
+    months = pd.Index(months, dtype=str)
+    return months.str[:4].astype(int).to_numpy() * 12 + months.str[5:7].astype(int).to_numpy() - 1
+
+
+def next_month(month):
+    t = int(month_index([month])[0]) + 1
+    return f"{t // 12:04d}-{t % 12 + 1:02d}"
+
+
+def design(months):
+    t = month_index(months).astype("float64")
+    return np.column_stack([np.ones(len(t)), t])
+
+
+def monthly_costs(df, by):
+    """Cost per month (rows) for every ``(by value, tag status)`` series (columns).
+
+    Months without cost for a series are 0; a missing ``by`` value and an
+    unknown tag status are labelled rather than dropped.
+    """
+    status = df[TAGGED_COLUMN].map(TAG_LABELS).fillna(UNKNOWN_LABEL)
+    costs = df[COST_COLUMN].astype("float64").groupby(
+        [df[MONTH_COLUMN].astype(str), df[by], status], observed=True, dropna=False
+    ).sum()
+    wide = costs.unstack([1, 2], fill_value=0.0).sort_index()
+    wide.columns = pd.MultiIndex.from_arrays(
+        [wide.columns.get_level_values(0).astype(object).fillna(MISSING_LABEL).astype(str),
+         wide.columns.get_level_values(1).astype(str)],
+        names=[by, TAG_STATUS],
+    )
+    wide = wide.T.groupby(level=[0, 1]).sum().T  # merge labels that collided
+    wide.index.name = MONTH_COLUMN
+    return wide.astype("float64")
+
+
+def _fit_block(X, Y):
+    return sm.OLS(Y, X).fit().params
+
+
+def fit_params(X, Y, workers=None, block=SERIES_BLOCK):
+    """OLS intercept/slope for every column of ``Y``, fitted in column blocks."""
+    if Y.shape[1] == 0:
+        return np.zeros((2, 0))
+    blocks = [Y[:, start:start + block] for start in range(0, Y.shape[1], block)]
+    params = map_tasks(partial(_fit_block, X), blocks, workers)
+    return np.hstack([np.asarray(p).reshape(2, -1) for p in params])
+
+
+class TrendModel:
+    """Linear trend per series, kept as sufficient statistics for cheap updates."""
+
+    def __init__(self, by):
+        self.by = by
+        self.months = {}  # month -> version of the data it was fitted from
+        self.columns = pd.MultiIndex.from_arrays([[], []], names=[by, TAG_STATUS])
+        self.history = pd.DataFrame(columns=self.columns, dtype="float64")
+        self.xtx = np.zeros((2, 2))
+        self.xty = np.zeros((2, 0))
+        self.yty = np.zeros(0)
+        self.params = np.zeros((2, 0))
+
+    @property
+    def n_months(self):
+        return len(self.months)
+
+    def update(self, costs, versions=None, workers=None):
+        """Add the months in ``costs`` (``monthly_costs`` output) and refit."""
+        costs = costs.loc[~costs.index.isin(list(self.months))]
+        if costs.empty:
+            return self
+        columns = self.columns.union(costs.columns, sort=False)
+        self.xty = self._align(self.xty, columns)
+        self.yty = self._align(self.yty, columns)
+        self.columns = columns
+        Y = costs.reindex(columns=columns, fill_value=0.0).to_numpy(dtype="float64")
+        X = design(costs.index)
+
+        self.xtx += X.T @ X
+        self.xty += X.T @ Y
+        self.yty += np.einsum("ij,ij->j", Y, Y)
+        for month in costs.index:
+            self.months[month] = (versions or {}).get(month)
+        # Monthly totals are tiny next to the billing rows; kept for charts
+        self.history = pd.concat([self.history, costs]).reindex(columns=columns, fill_value=0.0)
+        self.history = self.history.fillna(0.0).sort_index()
+
+        if self.n_months == len(costs):
+            # First fit: the batched statsmodels OLS over all series
+            self.params = fit_params(X, Y, workers) if len(costs) > 1 else self._solve()
+        else:
+            self.params = self._solve()
+        return self
+
+    def _align(self, values, columns):
+        out = np.zeros(values.shape[:-1] + (len(columns),))
+        if len(self.columns):
+            out[..., columns.get_indexer(self.columns)] = values
+        return out
+
+    def _solve(self):
+        if self.n_months < 2:
+            # One month: flat trend at that month's cost
+            intercept = self.xty[0] / max(self.xtx[0, 0], 1.0)
+            return np.vstack([intercept, np.zeros_like(intercept)])
+        return np.linalg.solve(self.xtx, self.xty)
+
+    def forecast(self, month=None, level=0.95):
+        """Next-month (or ``month``) forecast per series with a ``level`` prediction interval.
+
+        The interval uses the t distribution with ``n - 2`` degrees of
+        freedom, as OLS prediction intervals do; with few months it is wide.
+        """
+        month = month or next_month(max(self.months))
+        x0 = design([month])[0]
+        mean = x0 @ self.params
+        n = self.n_months
+        if n > 2:
+            ssr = np.maximum(self.yty - np.einsum("ij,ij->j", self.params, self.xty), 0.0)
+            leverage = x0 @ np.linalg.solve(self.xtx, x0)
+            t = stats.t.ppf(0.5 + level / 2, n - 2)
+            half = t * np.sqrt(ssr / (n - 2) * (1.0 + leverage))
+        else:
+            half = np.full_like(mean, np.nan)
+        out = pd.DataFrame({
+            "LastMonthCost": self.history.iloc[-1].to_numpy(),
+            "Slope": self.params[1],
+            "Forecast": np.maximum(mean, 0.0),
+            "Lower": np.maximum(mean - half, 0.0),
+            "Upper": np.maximum(mean + half, 0.0),
+        }, index=self.columns)
+        out.attrs[MONTH_COLUMN] = month
+        return out
+
+
+def fit_trends(costs, by, workers=None):
+    """A fresh ``TrendModel`` for ``monthly_costs(df, by)``."""
+    return TrendModel(by).update(costs, workers=workers)
+
+
+# ----------------------------------------------------------
+# PERSISTED MODELS (partitioned store)
+# ----------------------------------------------------------
+def month_versions(partitions):
+    """Version per billing month from the partition files behind it."""
+    return {
+        month: hashlib.sha256("\n".join(sorted(group["path"])).encode()).hexdigest()
+        for month, group in partitions.groupby(MONTH_COLUMN)
+    }
+
+
+class TrendStore:
+    """Fitted models on disk, one per dimension, updated month by month.
+
+    Months already fitted are never reloaded; a month whose partitions
+    changed (re-ingested export) triggers one full refit.
+    """
+
+    def __init__(self, cache_dir=os.path.join(DEFAULT_CACHE_DIR, "trends")):
+        self.cache_dir = cache_dir
+
+    def _path(self, by):
+        return os.path.join(self.cache_dir, f"{by}.pkl")
+
+    def _read(self, by):
+        try:
+            with open(self._path(by), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _write(self, model):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with atomic_path(self._path(model.by)) as tmp, open(tmp, "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def model(self, by, store_dir, partitions, workers=None):
+        """Up-to-date model for ``by`` over every month in ``partitions``."""
+        versions = month_versions(partitions)
+        model = self._read(by)
+        if model is None or any(versions.get(m) != v for m, v in model.months.items()):
+            model = TrendModel(by)
+        new = [month for month in sorted(versions) if month not in model.months]
+        if not new:
+            return model
+        frame = load_partitions(
+            store_dir,
+            partitions[partitions[MONTH_COLUMN].isin(new)],
+            columns=[by, TAGGED_COLUMN, COST_COLUMN, MONTH_COLUMN],
+        )
+        model.update(monthly_costs(frame, by), versions, workers)
+        self._write(model)
+        return model
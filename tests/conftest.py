@@ -0,0 +1,18 @@
+import pytest
+
+from benchmarks.synthetic import write_billing_csv
+from cloudmart.ingest import load_billing_csv
+
+ROWS = 3_000
+
+
+@pytest.fixture(scope="session")
+def billing_csv(tmp_path_factory):
+    """Quoted-line synthetic export, like the sample file."""
+    path = tmp_path_factory.mktemp("data") / "billing.csv"
+    return str(write_billing_csv(str(path), ROWS, chunk_rows=1_000, departments=5, projects=9, seed=3))
+
+
+@pytest.fixture(scope="session")
+def billing_df(billing_csv):
+    return load_billing_csv(billing_csv, workers=1)
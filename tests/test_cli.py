@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import write_billing_csv
+from cloudmart.cli import expand_inputs, main, run_report
+from cloudmart.ingest import load_billing_csv
+from cloudmart.reports import build_reports
+
+
+@pytest.fixture
+def exports(tmp_path):
+    source = tmp_path / "exports"
+    source.mkdir()
+    for i in range(2):
+        write_billing_csv(str(source / f"bill_{i}.csv"), 400, seed=i)
+    (source / "notes.txt").write_text("not billing data")
+    return str(source)
+
+
+def test_expand_inputs_reads_directories_and_files(exports, billing_csv):
+    paths = expand_inputs([exports, billing_csv])
+    assert [os.path.basename(p) for p in paths] == ["bill_0.csv", "bill_1.csv", "billing.csv"]
+
+
+def test_report_matches_the_dashboard_tables(billing_csv, billing_df, tmp_path):
+    out = str(tmp_path / "out")
+    written = run_report([billing_csv], out, ("csv", "json"), workers=1)
+    tables, summary = build_reports(billing_df)
+    assert len(written) == 2 * len(tables) + 1
+    expected = tables["cost_by_tag_status"].reset_index(drop=True)
+    pd.testing.assert_frame_equal(pd.read_csv(os.path.join(out, "cost_by_tag_status.csv")), expected,
+                                  check_dtype=False, check_exact=False)
+    assert len(pd.read_json(os.path.join(out, "untagged_resources.json"))) == summary["untagged"]
+    with open(os.path.join(out, "summary.json")) as f:
+        saved = json.load(f)
+    assert saved["sources"] == [billing_csv]
+    assert saved["total"] == len(billing_df)
+    assert saved["untagged_cost_pct"] == pytest.approx(summary["untagged_cost_pct"])
+
+
+def test_many_files_load_in_a_pool(exports, tmp_path):
+    serial, pooled = str(tmp_path / "serial"), str(tmp_path / "pooled")
+    run_report([exports], serial, workers=1)
+    run_report([exports], pooled, workers=2)
+    for name in sorted(os.listdir(serial)):
+        with open(os.path.join(serial, name), "rb") as a, open(os.path.join(pooled, name), "rb") as b:
+            assert a.read() == b.read(), name
+    with open(os.path.join(serial, "summary.json")) as f:
+        assert json.load(f)["total"] == sum(len(load_billing_csv(p)) for p in expand_inputs([exports]))
+
+
+def test_main_prints_written_paths(billing_csv, tmp_path, capsys):
+    out = str(tmp_path / "out")
+    assert main(["report", billing_csv, "--out", out, "--format", "parquet", "--workers", "1"]) == 0
+    printed = capsys.readouterr().out.split()
+    assert os.path.join(out, "summary.json") in printed
+    assert all(p.endswith((".parquet", ".json")) and os.path.exists(p) for p in printed)
+
+
+def test_empty_input_directory_fails(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        run_report([str(tmp_path)], str(tmp_path / "out"))
+
+
+def test_module_entry_point(billing_csv, tmp_path):
+    out = str(tmp_path / "out")
+    result = subprocess.run([sys.executable, "-m", "cloudmart", "report", billing_csv, "--out", out],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+    assert result.returncode == 0, result.stderr
+    assert os.path.exists(os.path.join(out, "summary.json"))
@@ -0,0 +1,79 @@
+import gzip
+import io
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from cloudmart.export import ExportCache, export_key, frame_chunks, write_export
+
+
+@pytest.mark.parametrize("fmt", ["csv", "csv.gz", "parquet"])
+def test_chunked_export_round_trips(billing_df, tmp_path, fmt):
+    path = write_export(frame_chunks(billing_df, chunk_rows=700), str(tmp_path / f"out.{fmt}"), fmt)
+    if fmt == "parquet":
+        back = pd.read_parquet(path)
+    else:
+        back = pd.read_csv(path, dtype={"AccountID": str})
+    assert os.listdir(tmp_path) == [f"out.{fmt}"]
+    assert len(back) == len(billing_df)
+    assert list(back.columns) == list(billing_df.columns)
+    assert set(back["Tagged"]) == {"Yes", "No"}
+    assert list(back["Tagged"] == "Yes") == list(billing_df["Tagged"])
+    assert list(back["ResourceID"]) == list(billing_df["ResourceID"])
+
+
+def test_gzip_export_is_byte_identical(billing_df, tmp_path):
+    a = write_export(frame_chunks(billing_df), str(tmp_path / "a.csv.gz"), "csv.gz")
+    b = write_export(frame_chunks(billing_df, chunk_rows=999), str(tmp_path / "b.csv.gz"), "csv.gz")
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        assert fa.read() == fb.read()
+    with gzip.open(a, "rt") as f:
+        assert f.readline().startswith("AccountID,ResourceID")
+
+
+def test_unknown_format_is_rejected(billing_df, tmp_path):
+    with pytest.raises(ValueError, match="Unknown export format"):
+        write_export(frame_chunks(billing_df), str(tmp_path / "out.xlsx"), "xlsx")
+
+
+def test_cache_hits_skip_the_writer_and_evict_oldest(billing_df, tmp_path):
+    cache = ExportCache(str(tmp_path), max_files=2)
+    calls = []
+
+    def chunks():
+        calls.append(1)
+        return frame_chunks(billing_df.head(10))
+
+    first = cache.read("rows", export_key("v1"), "csv", chunks)
+    assert cache.read("rows", export_key("v1"), "csv", chunks) == first
+    assert len(calls) == 1
+    assert pd.read_csv(io.BytesIO(first)).shape == (10, billing_df.shape[1])
+
+    for version in ["v2", "v3"]:
+        cache.build("rows", export_key(version), "csv", chunks)
+    assert not os.path.exists(cache.path("rows", export_key("v1"), "csv"))
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_slow_export_does_not_block_other_keys(billing_df, tmp_path):
+    cache = ExportCache(str(tmp_path))
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return frame_chunks(billing_df.head(5))
+
+    worker = threading.Thread(target=cache.build, args=("rows", "slow", "csv", slow))
+    worker.start()
+    try:
+        assert started.wait(5)
+        path = cache.build("rows", "fast", "csv", lambda: frame_chunks(billing_df.head(5)))
+        assert os.path.exists(path)
+        assert not os.path.exists(cache.path("rows", "slow", "csv"))
+    finally:
+        release.set()
+        worker.join()
+    assert os.path.exists(cache.path("rows", "slow", "csv"))
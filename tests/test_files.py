@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from cloudmart.files import atomic_path, evict_lru
+
+
+def test_atomic_path_replaces_only_on_success(tmp_path):
+    path = str(tmp_path / "out.txt")
+    with open(path, "w") as f:
+        f.write("old")
+    with pytest.raises(RuntimeError):
+        with atomic_path(path) as tmp, open(tmp, "w") as f:
+            f.write("half")
+            raise RuntimeError("writer failed")
+    assert open(path).read() == "old"
+    assert os.listdir(tmp_path) == ["out.txt"]
+
+    with atomic_path(path) as tmp, open(tmp, "w") as f:
+        f.write("new")
+    assert open(path).read() == "new"
+    assert os.listdir(tmp_path) == ["out.txt"]
+
+
+def test_evict_lru_keeps_newest_matching_files(tmp_path):
+    for i in range(5):
+        path = tmp_path / f"m{i}.joblib"
+        path.write_text("x")
+        os.utime(path, (i, i))
+    (tmp_path / "notes.txt").write_text("x")
+    (tmp_path / "m9.joblib.abc.tmp").write_text("x")
+
+    removed = evict_lru(str(tmp_path), 2, suffix=".joblib")
+    assert sorted(os.path.basename(p) for p in removed) == ["m0.joblib", "m1.joblib", "m2.joblib"]
+    assert sorted(os.listdir(tmp_path)) == ["m3.joblib", "m4.joblib", "m9.joblib.abc.tmp", "notes.txt"]
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from cloudmart.filters import FilterIndex
+
+
+def isin_rows(df, filters):
+    """Row positions the dashboard used to get from chained ``isin`` masks."""
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        mask &= df[col].isin(values).to_numpy()
+    return np.flatnonzero(mask)
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"Department": ["Dept0", "Dept3"]},
+    {"Department": ["Dept1"], "Project": ["Proj2", "Proj4", "Proj8"], "Environment": ["Prod"]},
+    {"Service": ["EC2", "S3"], "Region": ["us-east-1"]},
+    {"Department": []},
+    {"Department": ["no-such-department"]},
+])
+def test_select_matches_isin(billing_df, filters):
+    index = FilterIndex(billing_df)
+    np.testing.assert_array_equal(index.select(filters), isin_rows(billing_df, filters))
+
+
+def test_select_all_values_keeps_null_rows_out_like_isin(billing_df):
+    index = FilterIndex(billing_df)
+    filters = {col: index.values(col) for col in ("Department", "Project", "Environment")}
+    assert billing_df["Department"].isna().any()
+    np.testing.assert_array_equal(index.select(filters), isin_rows(billing_df, filters))
+
+
+def test_select_is_cached_and_read_only(billing_df):
+    index = FilterIndex(billing_df)
+    rows = index.select({"Department": ["Dept2"]})
+    assert index.select({"Department": ["Dept2"]}) is rows
+    assert not rows.flags.writeable
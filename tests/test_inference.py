@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from cloudmart.compliance import present
+from cloudmart.inference import CONFIDENCE_COLUMN, TagSuggester, encode, load_suggester, resource_prefix
+from cloudmart.remediation import unedited
+
+TAGS = ["Department", "Owner"]
+
+
+def team_frame(rows=200):
+    """Department follows Service and Owner follows Department; every 10th row lacks Department."""
+    service = np.where(np.arange(rows) % 2 == 0, "EC2", "S3")
+    department = pd.Series(np.where(service == "EC2", "Eng", "Finance"), dtype=object)
+    department[::10] = None
+    return pd.DataFrame({
+        "AccountID": "1001",
+        "ResourceID": [f"{s.lower()}-{i:04d}" for i, s in enumerate(service)],
+        "Service": service,
+        "Region": "us-east-1",
+        "Department": department,
+        "Owner": np.where(service == "EC2", "alice", "bob"),
+    })
+
+
+def test_resource_prefix_and_encode():
+    assert list(resource_prefix(pd.Series(["ec2-004", "s3-bucket-1", "plain"]))) == ["ec2", "s3", "plain"]
+    codes = encode(pd.Series(["b", None, "a", "zzz"], dtype=object), pd.Index(["a", "b"]))
+    assert list(codes) == [2, 0, 1, 0]
+
+
+def test_suggests_missing_tags_from_related_columns():
+    df = team_frame()
+    suggestions = TagSuggester(TAGS).fit(df).suggest(df)
+    missing = np.flatnonzero(~present(df["Department"]))
+    assert list(suggestions["row"]) == list(missing)
+    assert set(suggestions["column"]) == {"Department"}
+    expected = np.where(df["Service"].to_numpy()[missing] == "EC2", "Eng", "Finance")
+    assert list(suggestions["value"]) == list(expected)
+    assert (suggestions[CONFIDENCE_COLUMN] > 0.9).all()
+
+
+def test_rows_limit_the_pass_but_keep_frame_positions():
+    df = team_frame()
+    suggestions = TagSuggester(TAGS).fit(df).suggest(df, rows=[5, 10, 20, 21])
+    assert list(suggestions["row"]) == [10, 20]
+
+
+def test_no_missing_tags_gives_empty_frame():
+    df = team_frame().dropna()
+    suggestions = TagSuggester(TAGS).fit(df).suggest(df)
+    assert suggestions.empty
+    assert list(suggestions.columns) == ["row", "column", "value", CONFIDENCE_COLUMN]
+
+
+def test_saved_models_are_reused_and_bounded(tmp_path):
+    df = team_frame()
+    cache = str(tmp_path)
+    first = load_suggester(df, "a" * 64, TAGS, cache_dir=cache, max_files=2)
+    model_dir = tmp_path / "models"
+    (path,) = os.listdir(model_dir)
+    os.utime(model_dir / path, (0, 0))
+    again = load_suggester(df, "a" * 64, TAGS, cache_dir=cache, max_files=2)
+    assert set(again.models) == set(first.models)
+    assert os.path.getmtime(model_dir / path) > 0  # a hit refreshes its LRU position
+
+    for version in "bc":
+        load_suggester(df, version * 64, TAGS, cache_dir=cache, max_files=2)
+    names = sorted(os.listdir(model_dir))
+    assert len(names) == 2
+    assert not any(name.startswith("tags-" + "a" * 16) for name in names)
+
+
+def test_unedited_keeps_analyst_cells():
+    suggestions = pd.DataFrame({"row": [1, 2, 3], "column": ["Owner"] * 3, "value": ["a", "b", "c"]})
+    edits = pd.DataFrame({"row": [2, 3], "column": ["Owner", "Project"], "value": ["mine", "x"]})
+    fresh = unedited(suggestions, edits)
+    assert list(zip(fresh["row"], fresh["value"])) == [(1, "a"), (3, "c")]
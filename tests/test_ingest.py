@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cloudmart.ingest import CATEGORY_COLUMNS, load_billing_csv
+
+CSV = """AccountID,ResourceID,Service,Department,MonthlyCostUSD,Tagged
+"1001,i-1,EC2,Sales,12.5,Yes"
+1001,i-2,EC2,,N/A,no
+1002,i-3,S3,Finance,$12.50,YES
+
+1002,i-4,S3,Finance,,No
+1002,i-5,RDS,"Sales, EMEA", 7 ,maybe
+"""
+
+
+@pytest.fixture
+def messy_csv(tmp_path):
+    path = tmp_path / "messy.csv"
+    path.write_text(CSV)
+    return str(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_malformed_costs_become_null(messy_csv, workers):
+    df = load_billing_csv(messy_csv, workers=workers, range_bytes=64)
+    assert df["MonthlyCostUSD"].dtype == np.float32
+    np.testing.assert_array_equal(df["MonthlyCostUSD"].to_numpy(), [12.5, np.nan, np.nan, np.nan, 7.0])
+
+
+def test_typed_columns_and_tagged_flags(messy_csv):
+    df = load_billing_csv(messy_csv, workers=1)
+    assert list(df["ResourceID"]) == ["i-1", "i-2", "i-3", "i-4", "i-5"]
+    for col in set(CATEGORY_COLUMNS) & set(df.columns):
+        assert isinstance(df[col].dtype, pd.CategoricalDtype)
+    assert df["Department"].isna().tolist() == [False, True, False, False, False]
+    assert df["Department"].iloc[4] == "Sales, EMEA"
+    assert df["Tagged"].tolist() == [True, False, True, False, pd.NA]
+
+
+def test_chunked_load_matches_single_chunk(billing_csv):
+    pd.testing.assert_frame_equal(load_billing_csv(billing_csv, chunk_rows=128, workers=1),
+                                  load_billing_csv(billing_csv, workers=1))
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cloudmart.paging import page_bounds, search_positions, sort_positions
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "Service": pd.Categorical(["EC2", "S3", "ec2-spot", None, "RDS"]),
+        "Owner": ["ann@x.com", None, "Bob@x.com", "bob@y.com", ""],
+        "Cost": [5.0, 1.0, np.nan, 3.0, 2.0],
+    })
+
+
+def test_search_ignores_case_across_columns(frame):
+    np.testing.assert_array_equal(search_positions(frame, "ec2"), [0, 2])
+    np.testing.assert_array_equal(search_positions(frame, " BOB "), [2, 3])
+    np.testing.assert_array_equal(search_positions(frame, "x.com", columns=["Owner"]), [0, 2])
+
+
+def test_search_stays_within_positions(frame):
+    np.testing.assert_array_equal(search_positions(frame, "ec2", positions=[2, 3, 4]), [2])
+    np.testing.assert_array_equal(search_positions(frame, "", positions=[4, 1]), [4, 1])
+
+
+def test_sort_is_stable_with_missing_last(frame):
+    np.testing.assert_array_equal(sort_positions(frame, [0, 1, 2, 3, 4], "Cost"), [1, 4, 3, 0, 2])
+    np.testing.assert_array_equal(sort_positions(frame, [0, 1, 2, 3, 4], "Cost", ascending=False),
+                                  [0, 3, 4, 1, 2])
+    np.testing.assert_array_equal(sort_positions(frame, [3, 0], None), [3, 0])
+
+
+@pytest.mark.parametrize("total, page, size, expected", [
+    (0, 1, 25, (0, 0, 1)),
+    (60, 1, 25, (0, 25, 3)),
+    (60, 3, 25, (50, 60, 3)),
+    (60, 9, 25, (50, 60, 3)),
+    (60, 0, 25, (0, 25, 3)),
+])
+def test_page_bounds_clamps_to_existing_pages(total, page, size, expected):
+    assert page_bounds(total, page, size) == expected
@@ -0,0 +1,54 @@
+"""The process-pool path must give the same results as the serial one."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cloudmart import compliance, cube, parallel
+from cloudmart.compliance import TAG_FIELDS, score_completeness
+from cloudmart.cube import build_cost_cube
+from cloudmart.ingest import load_billing_csv
+
+
+@pytest.fixture
+def small_slices(monkeypatch):
+    # Several row slices even for a small frame, so partial results get merged
+    def row_slices(df):
+        return parallel.row_slices(df, rows=700)
+    monkeypatch.setattr(cube, "row_slices", row_slices)
+    monkeypatch.setattr(compliance, "row_slices", row_slices)
+
+
+def test_load_billing_csv_parallel_matches_serial(billing_csv):
+    serial = load_billing_csv(billing_csv, chunk_rows=500, workers=1)
+    parallel_df = load_billing_csv(billing_csv, workers=2, range_bytes=16_384)
+    assert len(serial) == 3_000
+    pd.testing.assert_frame_equal(parallel_df, serial)
+
+
+def _sorted_cube(frame):
+    dims = [col for col in frame.columns if col not in (cube.COST_COLUMN, cube.COUNT_COLUMN)]
+    return frame.sort_values(dims, na_position="last", ignore_index=True)
+
+
+def test_build_cost_cube_parallel_matches_serial(billing_df, small_slices):
+    whole = cube.partial_cube(billing_df)
+    serial = build_cost_cube(billing_df, workers=1)
+    parallel_cube = build_cost_cube(billing_df, workers=2)
+    pd.testing.assert_frame_equal(parallel_cube, serial)
+    pd.testing.assert_frame_equal(_sorted_cube(serial), _sorted_cube(whole))
+    assert serial[cube.COUNT_COLUMN].sum() == len(billing_df)
+
+
+def test_score_completeness_parallel_matches_serial(billing_df, small_slices):
+    serial = score_completeness(billing_df, TAG_FIELDS, workers=1)
+    parallel_report = score_completeness(billing_df, TAG_FIELDS, workers=2)
+    pd.testing.assert_series_equal(parallel_report.scores, serial.scores)
+    pd.testing.assert_frame_equal(parallel_report.missing_counts, serial.missing_counts)
+
+    filled = pd.DataFrame({
+        field: billing_df[field].notna() & (billing_df[field].astype(str) != "") for field in TAG_FIELDS
+    })
+    np.testing.assert_array_equal(serial.scores.to_numpy(), filled.sum(axis=1).to_numpy())
+    np.testing.assert_array_equal(serial.missing_counts["Missing Count"].to_numpy(),
+                                  (~filled).sum().to_numpy())
@@ -0,0 +1,114 @@
+import os
+import threading
+
+import pytest
+
+from benchmarks.synthetic import write_billing_csv
+from cloudmart.partitions import (
+    MANIFEST_NAME, MONTH_COLUMN, billing_month_from_name, ingest_directory, list_partitions,
+    load_partitions, partition_version, prune, source_listing, store_for,
+)
+
+
+def write_months(source_dir, months, rows=300, accounts=3):
+    os.makedirs(source_dir, exist_ok=True)
+    for i, month in enumerate(months):
+        write_billing_csv(os.path.join(source_dir, f"bill_{month}.csv"), rows, seed=i, accounts=accounts)
+
+
+@pytest.fixture
+def exports(tmp_path):
+    source = str(tmp_path / "exports")
+    write_months(source, ["2025-01", "2025-02"])
+    return source
+
+
+def test_billing_month_from_name():
+    assert billing_month_from_name("/x/bill_2025-03.csv") == "2025-03"
+    assert billing_month_from_name("acct1001_202411.csv") == "2024-11"
+    assert billing_month_from_name("bill_2025-13.csv") is None
+
+
+def test_ingest_splits_by_account_and_month(exports, tmp_path):
+    store = str(tmp_path / "store")
+    assert len(ingest_directory(exports, store)) == 2
+    parts = list_partitions(store)
+    assert sorted(parts[MONTH_COLUMN].unique()) == ["2025-01", "2025-02"]
+    assert len(parts) == 6
+    frame = load_partitions(store, prune(parts, accounts=["1001"], months=["2025-02"]))
+    assert set(frame["AccountID"].astype(str)) == {"1001"}
+    assert set(frame[MONTH_COLUMN].astype(str)) == {"2025-02"}
+    assert len(load_partitions(store, parts)) == 600
+
+
+def test_reingest_skips_unchanged_and_keeps_manifest(exports, tmp_path):
+    store = str(tmp_path / "store")
+    ingest_directory(exports, store)
+    manifest = os.path.join(store, MANIFEST_NAME)
+    before = os.stat(manifest).st_mtime_ns
+    os.utime(os.path.join(exports, "bill_2025-01.csv"))  # touched, same content
+    assert ingest_directory(exports, store) == []
+    assert ingest_directory(exports, store) == []
+    version = partition_version(list_partitions(store))
+
+    write_months(exports, ["2025-02"], rows=100)  # content change replaces its parts
+    assert ingest_directory(exports, store) == [os.path.join(exports, "bill_2025-02.csv")]
+    assert partition_version(list_partitions(store)) != version
+    assert len(load_partitions(store, list_partitions(store))) == 400
+    assert os.stat(manifest).st_mtime_ns != before
+
+
+def test_deleted_sources_are_pruned(exports, tmp_path):
+    store = str(tmp_path / "store")
+    ingest_directory(exports, store)
+    gone = list_partitions(store).query(f"{MONTH_COLUMN} == '2025-02'")["path"]
+    os.remove(os.path.join(exports, "bill_2025-02.csv"))
+    ingest_directory(exports, store)
+    assert list(list_partitions(store)[MONTH_COLUMN].unique()) == ["2025-01"]
+    assert not any(os.path.exists(os.path.join(store, part)) for part in gone)
+
+
+def test_switching_source_directory_drops_the_old_partitions(exports, tmp_path):
+    other = str(tmp_path / "expB")
+    write_months(other, ["2024-12"])
+    store = str(tmp_path / "store")
+    ingest_directory(exports, store)
+    ingest_directory(other, store)
+    assert list(list_partitions(store)[MONTH_COLUMN].unique()) == ["2024-12"]
+
+
+def test_each_source_directory_gets_its_own_store(tmp_path):
+    cache = str(tmp_path / "cache")
+    a, b = store_for(str(tmp_path / "a" / "exports"), cache), store_for(str(tmp_path / "b" / "exports"), cache)
+    assert a != b
+    assert store_for(str(tmp_path / "a" / "exports") + os.sep, cache) == a
+
+
+def test_concurrent_ingests_do_not_collide(exports, tmp_path):
+    store = str(tmp_path / "store")
+    ingest_directory(exports, store)
+    os.utime(os.path.join(exports, "bill_2025-01.csv"))
+    errors = []
+
+    def run():
+        try:
+            ingest_directory(exports, store)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert not [name for name in os.listdir(store) if name.endswith(".tmp")]
+    assert len(list_partitions(store)) == 6
+
+
+def test_source_listing_changes_with_the_directory(exports):
+    listing = source_listing(exports)
+    assert [name for name, _, _ in listing] == ["bill_2025-01.csv", "bill_2025-02.csv"]
+    assert source_listing(exports) == listing
+    write_months(exports, ["2025-03"])
+    assert source_listing(exports) != listing
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cloudmart import parallel, policy as policy_module
+from cloudmart.compliance import REQUIRED_TAGS
+from cloudmart.policy import POLICY_ENV, evaluate_policy, load_policy, parse_policy, value_mask
+
+POLICY = r"""
+required_tags: [Department, Owner]
+rules:
+  - id: prod-owner
+    description: Prod needs an Owner
+    when: {Environment: Prod}
+    require: Owner
+  - id: cc-format
+    match: {CostCenter: 'CC\d{3}'}
+  - id: envs
+    allowed: {Environment: [Prod, Dev]}
+"""
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "Environment": pd.Categorical(["Prod", "Prod", "Dev", "Test", None, "Prod"]),
+        "Owner": ["a@x", None, None, "", "b@x", ""],
+        "CostCenter": ["CC101", "CC1", None, "XX999", "CC202", "CC3030"],
+        "MonthlyCostUSD": [10.0, 20.0, 30.0, 40.0, np.nan, 60.0],
+    })
+
+
+def test_parse_policy_compiles_rules():
+    policy = parse_policy(POLICY)
+    assert policy.required_tags == ["Department", "Owner"]
+    assert policy.rule_ids == ["prod-owner", "cc-format", "envs"]
+    assert policy.rules[0].require == ["Owner"]
+    assert policy.version == parse_policy(POLICY).version != parse_policy(POLICY + "\n# edited").version
+
+
+def test_default_policy_file_loads(monkeypatch):
+    monkeypatch.delenv(POLICY_ENV, raising=False)
+    policy = load_policy()
+    assert policy.required_tags == REQUIRED_TAGS
+    assert "required-tags" in policy.rule_ids
+
+
+def test_policy_env_overrides_default(monkeypatch, tmp_path):
+    path = tmp_path / "policy.yaml"
+    path.write_text(POLICY)
+    monkeypatch.setenv(POLICY_ENV, str(path))
+    assert load_policy().rule_ids == ["prod-owner", "cc-format", "envs"]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("rules: [{id: r, match: 'CC\\d{3}'}]", "'match' must map"),
+    ("rules: [{id: r, when: Prod, require: [Owner]}]", "'when' must map"),
+    ("rules: [{id: r, allowed: [Prod, Dev]}]", "'allowed' must map"),
+    ("required_tags: Owner\nrules: []", "'required_tags' must be a list"),
+    ("rules: {id: r, require: Owner}", "'rules' must be a list"),
+    ("rules: [Owner]", "must be a mapping"),
+    ("rules: [{id: r, require: Owner, severity: high}]", "unknown keys"),
+    ("rules: [{id: r, description: nothing to check}]", "needs at least one"),
+    ("rules: [{id: r, match: {Owner: '('}}]", "invalid regex"),
+    ("rules: [{id: r, require: Owner}, {id: r, require: Project}]", "unique"),
+    ("rules: [\n", "not valid YAML"),
+    ("- just a list", "must be a mapping"),
+])
+def test_malformed_policies_raise_value_error(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_policy(text)
+
+
+def test_value_mask_tests_each_value_once(frame):
+    seen = []
+
+    def test(value):
+        seen.append(value)
+        return value == "Prod"
+
+    mask = value_mask(frame["Environment"], test)
+    np.testing.assert_array_equal(mask, [True, True, False, False, False, True])
+    assert sorted(seen) == ["Dev", "Prod", "Test"]
+    np.testing.assert_array_equal(value_mask(frame["Owner"], lambda v: v.endswith("@x")),
+                                  [True, False, False, False, True, False])
+
+
+def test_evaluate_policy_flags_each_rule(frame):
+    report = evaluate_policy(frame, parse_policy(POLICY), workers=1)
+    assert {rule: list(rows) for rule, rows in report.violations.items()} == {
+        "prod-owner": [1, 5],   # in scope (Prod) and Owner missing or empty
+        "cc-format": [1, 3, 5],  # filled in but not CC + 3 digits
+        "envs": [3],             # Test is not allowed; missing is not checked
+    }
+    assert report.in_scope == {"prod-owner": 3, "cc-format": 6, "envs": 6}
+    np.testing.assert_array_equal(report.violators(), [1, 3, 5])
+    assert report.cost_at_risk() == 120.0
+    assert report.cost_at_risk(rows=[0, 1, 2]) == 20.0
+
+    summary = report.summary(rows=[3, 4, 5]).set_index("Rule")
+    assert summary["Violations"].to_dict() == {"prod-owner": 1, "cc-format": 2, "envs": 1}
+    assert summary["Cost at Risk (USD)"].to_dict() == {"prod-owner": 60.0, "cc-format": 100.0, "envs": 40.0}
+
+
+def test_rules_on_missing_columns_flag_required_only(frame):
+    report = evaluate_policy(frame, parse_policy(
+        "rules: [{id: need, require: Project}, {id: fmt, match: {Project: 'P.*'}}]"
+    ))
+    assert len(report.violators("need")) == len(frame)
+    assert len(report.violators("fmt")) == 0
+
+
+def test_evaluate_policy_parallel_matches_serial(billing_df, monkeypatch):
+    monkeypatch.setattr(policy_module, "row_slices", lambda df: parallel.row_slices(df, rows=700))
+    policy = load_policy(policy_module.DEFAULT_POLICY_PATH)
+    serial = evaluate_policy(billing_df, policy, workers=1)
+    pooled = evaluate_policy(billing_df, policy, workers=2)
+    for rule_id in policy.rule_ids:
+        np.testing.assert_array_equal(pooled.violators(rule_id), serial.violators(rule_id))
+    pd.testing.assert_frame_equal(pooled.summary(), serial.summary())
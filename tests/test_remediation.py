@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cloudmart.ingest import TAGGED_COLUMN
+from cloudmart.remediation import RemediationEngine, empty_diff, merge_diffs
+
+
+@pytest.fixture
+def engine(billing_df):
+    return RemediationEngine(billing_df)
+
+
+def edit_untagged(engine, n=50, owner="fixed@cloudmart.com"):
+    """Editor-style frame: the first ``n`` untagged rows with Owner filled in."""
+    edited = engine.untagged().head(n).astype(object)
+    edited["Owner"] = owner
+    return edited
+
+
+def expected_frame(df, edited, required_tags):
+    """Remediated frame computed row by row, the way Tab 5 used to do it."""
+    out = df.astype(object)
+    for _, row in edited.iterrows():
+        match = out["ResourceID"] == row["ResourceID"]
+        for tag in required_tags:
+            out.loc[match, tag] = row[tag]
+    filled = pd.DataFrame({tag: out[tag].notna() & (out[tag].astype(str) != "") for tag in required_tags})
+    touched = out["ResourceID"].isin(edited["ResourceID"])
+    out.loc[touched, TAGGED_COLUMN] = filled[touched].all(axis=1)
+    return out
+
+
+def test_diff_holds_only_changed_cells(engine):
+    edited = edit_untagged(engine)
+    diff = engine.diff(edited)
+    assert set(diff["column"]) == {"Owner"}
+    assert (diff["value"] == "fixed@cloudmart.com").all()
+    assert engine.diff(engine.untagged().head(50)).empty
+
+
+def test_materialize_matches_row_by_row_edit(engine, billing_df):
+    edited = edit_untagged(engine)
+    result = engine.materialize(engine.diff(edited))
+    expected = expected_frame(billing_df, edited, engine.required_tags)
+    pd.testing.assert_frame_equal(result.astype(object), expected, check_dtype=False)
+    assert list(result.dtypes) == list(billing_df.dtypes)
+
+
+def test_iter_materialized_chunks_concatenate_to_materialize(engine):
+    diff = engine.diff(edit_untagged(engine, n=200))
+    whole = engine.materialize(diff)
+    chunks = list(engine.iter_materialized(diff, chunk_rows=700))
+    assert len(chunks) == 5
+    assert all((chunk.dtypes == whole.dtypes).all() for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks), whole)
+
+
+def test_tag_counts_match_materialized_frame(engine, billing_df):
+    diff = engine.diff(edit_untagged(engine, n=200))
+    counts = engine.tag_counts(diff)
+    expected = engine.materialize(diff)[TAGGED_COLUMN].value_counts()
+    pd.testing.assert_series_equal(counts.sort_index(), expected.sort_index(), check_names=False,
+                                   check_dtype=False)
+    pd.testing.assert_series_equal(engine.tag_counts(empty_diff()), billing_df[TAGGED_COLUMN].value_counts())
+
+
+def test_view_shows_diff_on_page_rows(engine):
+    diff = engine.diff(edit_untagged(engine, n=10))
+    rows = np.sort(diff["row"].to_numpy())[:5]
+    view = engine.view(rows, diff)
+    assert (view["Owner"] == "fixed@cloudmart.com").all()
+    pd.testing.assert_frame_equal(view, engine.materialize(diff).iloc[rows])
+
+
+
+def test_undone_edits_leave_the_diff(engine):
+    applied = engine.diff(edit_untagged(engine, n=10))
+    reverted = engine.untagged().head(10)
+    undo = engine.diff(reverted, applied)
+    assert len(undo) == len(applied)
+    assert engine.compact(merge_diffs(applied, undo)).empty
+    assert engine.diff(engine.view(applied["row"], applied), applied).empty
+
@@ -0,0 +1,39 @@
+import os
+import shutil
+
+import pandas as pd
+
+from benchmarks.synthetic import write_billing_csv
+from cloudmart.snapshot import load_snapshot, snapshot_path
+
+
+def test_same_named_sources_keep_separate_snapshots(billing_csv, billing_df, tmp_path):
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    other = str(other_dir / os.path.basename(billing_csv))
+    write_billing_csv(other, 200, seed=9)
+    cache = str(tmp_path / "cache")
+
+    fp_a, df_a = load_snapshot(billing_csv, cache)
+    fp_b, df_b = load_snapshot(other, cache)
+    assert os.path.exists(snapshot_path(billing_csv, fp_a, cache))
+    assert os.path.exists(snapshot_path(other, fp_b, cache))
+    pd.testing.assert_frame_equal(load_snapshot(billing_csv, cache)[1], billing_df)
+    assert len(load_snapshot(other, cache)[1]) == 200
+
+
+def test_stale_cleanup_only_touches_its_own_source(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    a, a_b = str(src / "a.csv"), str(src / "a-b.csv")
+    write_billing_csv(a, 100, seed=1)
+    write_billing_csv(a_b, 100, seed=2)
+    cache = str(tmp_path / "cache")
+    fp_a_b = load_snapshot(a_b, cache)[0]
+    old_a = snapshot_path(a, load_snapshot(a, cache)[0], cache)
+
+    shutil.copy(a_b, a)  # a.csv changes: only its old snapshot goes
+    fp_a = load_snapshot(a, cache)[0]
+    assert not os.path.exists(old_a)
+    assert os.path.exists(snapshot_path(a, fp_a, cache))
+    assert os.path.exists(snapshot_path(a_b, fp_a_b, cache))
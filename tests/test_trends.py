@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+
+from benchmarks.synthetic import write_billing_csv
+from cloudmart import trends
+from cloudmart.partitions import MONTH_COLUMN, ingest_directory, list_partitions, load_partitions
+from cloudmart.trends import (
+    MISSING_LABEL, TAG_STATUS, TrendModel, TrendStore, design, fit_trends, month_index, monthly_costs,
+    next_month,
+)
+
+MONTHS = ["2024-11", "2024-12", "2025-01", "2025-02", "2025-03", "2025-04"]
+
+
+def cost_frame(months=MONTHS, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = pd.MultiIndex.from_product([["Eng", "Ops"], ["Yes", "No"]], names=["Department", TAG_STATUS])
+    trend = np.arange(len(months))[:, None] * rng.uniform(5, 20, len(columns))
+    values = 1_000 + trend + rng.normal(0, 15, (len(months), len(columns)))
+    return pd.DataFrame(values, index=pd.Index(months, name=MONTH_COLUMN), columns=columns)
+
+
+def test_month_index_and_next_month():
+    assert list(np.diff(month_index(["2024-11", "2024-12", "2025-01", "2025-03"]))) == [1, 1, 2]
+    assert next_month("2024-12") == "2025-01"
+    assert next_month("2025-09") == "2025-10"
+
+
+def test_monthly_costs_labels_series():
+    df = pd.DataFrame({
+        MONTH_COLUMN: ["2025-01", "2025-01", "2025-02", "2025-02"],
+        "Department": pd.Series(["Eng", None, "Eng", "Eng"], dtype="category"),
+        "Tagged": pd.Series([True, False, None, True], dtype="boolean"),
+        "MonthlyCostUSD": np.array([1.0, 2.0, 4.0, 8.0], dtype="float32"),
+    })
+    wide = monthly_costs(df, "Department")
+    assert list(wide.index) == ["2025-01", "2025-02"]
+    assert wide[("Eng", "Yes")].tolist() == [1.0, 8.0]
+    assert wide[("Eng", "Unknown")].tolist() == [0.0, 4.0]
+    assert wide[(MISSING_LABEL, "No")].tolist() == [2.0, 0.0]
+
+
+def test_forecast_matches_statsmodels_prediction_interval():
+    costs = cost_frame()
+    out = fit_trends(costs, "Department").forecast()
+    assert out.attrs[MONTH_COLUMN] == "2025-05"
+    x0 = design(["2025-05"])
+    for column in costs.columns:
+        fit = sm.OLS(costs[column].to_numpy(), design(costs.index)).fit()
+        frame = fit.get_prediction(x0).summary_frame(alpha=0.05)
+        row = out.loc[column]
+        assert row["Forecast"] == pytest.approx(frame["mean"].iloc[0])
+        assert row["Lower"] == pytest.approx(frame["obs_ci_lower"].iloc[0])
+        assert row["Upper"] == pytest.approx(frame["obs_ci_upper"].iloc[0])
+
+
+def test_incremental_update_equals_full_fit():
+    costs = cost_frame()
+    late = costs.copy()
+    late[("Sec", "Yes")] = [0.0, 0.0, 0.0, 50.0, 70.0, 90.0]  # a series first seen in month 4
+    full = fit_trends(late, "Department")
+    model = TrendModel("Department").update(costs.iloc[:3]).update(late.iloc[3:])
+    assert model.n_months == len(MONTHS)
+    pd.testing.assert_frame_equal(model.forecast().sort_index(), full.forecast().sort_index(), rtol=1e-6)
+
+
+def write_months(source_dir, months, rows=300):
+    os.makedirs(source_dir, exist_ok=True)
+    for i, month in enumerate(months):
+        write_billing_csv(os.path.join(source_dir, f"bill_{month}.csv"), rows, seed=i, accounts=2)
+
+
+def test_store_fits_new_months_only_and_refits_changed_ones(tmp_path, monkeypatch):
+    source, store_dir = str(tmp_path / "exports"), str(tmp_path / "store")
+    write_months(source, MONTHS[:3])
+    ingest_directory(source, store_dir)
+    store = TrendStore(str(tmp_path / "trends"))
+    assert store.model("Service", store_dir, list_partitions(store_dir)).n_months == 3
+
+    loaded = []
+    monkeypatch.setattr(trends, "load_partitions", lambda *a, **k: loaded.append(a[1]) or load_partitions(*a, **k))
+    assert store.model("Service", store_dir, list_partitions(store_dir)).n_months == 3
+    assert loaded == []
+
+    write_months(source, MONTHS[:4])  # same first three months, one new
+    ingest_directory(source, store_dir)
+    model = store.model("Service", store_dir, list_partitions(store_dir))
+    assert list(loaded[-1][MONTH_COLUMN].unique()) == [MONTHS[3]]
+
+    write_billing_csv(os.path.join(source, f"bill_{MONTHS[0]}.csv"), 100, seed=42, accounts=2)
+    ingest_directory(source, store_dir)
+    parts = list_partitions(store_dir)
+    model = store.model("Service", store_dir, parts)
+    assert sorted(loaded[-1][MONTH_COLUMN].unique()) == MONTHS[:4]
+    full = fit_trends(monthly_costs(load_partitions(store_dir, parts), "Service"), "Service")
+    pd.testing.assert_frame_equal(model.forecast(), full.forecast(), rtol=1e-6)